@@ -1,18 +1,30 @@
+import argparse
+import atexit
 import pygame
 import sys
 import time
-import json
 import math
-import random
-from typing import List, Optional
-
-# Initialize Pygame
-pygame.init()
+from collections import OrderedDict
+
+import numpy as np
+
+import cycles
+import frames
+import hangman_solver
+import life
+import particles
+import patterns
+import profiling
+import scoreboard
+import tictactoe
+import tictactoe_ai
+import words
 
 # Window settings
 SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Game Menu")
+
+# Window, fonts and icons are created by init_display, so importing this module opens no window
+screen = None
 
 # Colors
 WHITE = (255, 255, 255)
@@ -27,20 +39,46 @@ DARK_GRAY = (50, 50, 50)
 YELLOW = (255, 223, 0)
 
 # Fonts
-font = pygame.font.Font(None, 50)
-small_font = pygame.font.Font(None, 36)
+font = None
+small_font = None
+overlay_font = None  # Profiler overlay
+
+# Rendered text by (font, text, color, antialias), the least recently used dropped first
+TEXT_CACHE_SIZE = 256
+text_cache = OrderedDict()
+
+
+def render_text(text_font, text, color, antialias=True):
+    key = (text_font, text, tuple(color), antialias)
+    surface = text_cache.get(key)
+    if surface is None:
+        surface = text_font.render(text, antialias, color)
+        text_cache[key] = surface
+        if len(text_cache) > TEXT_CACHE_SIZE:
+            text_cache.popitem(last=False)
+    else:
+        text_cache.move_to_end(key)
+    return surface
 
 
-# Utility function for gradient background
+# Gradient surfaces by colors, two screens tall so any scroll offset is covered
+gradients = {}
 
+
+def gradient_surface(color1, color2):
+    key = (tuple(color1), tuple(color2))
+    if key not in gradients:
+        ratio = (np.arange(2 * SCREEN_HEIGHT) % SCREEN_HEIGHT / SCREEN_HEIGHT)[:, None]
+        column = (np.array(color1) * (1 - ratio) + np.array(color2) * ratio).astype(np.uint8)
+        pixels = np.broadcast_to(column[None], (SCREEN_WIDTH, 2 * SCREEN_HEIGHT, 3))
+        gradients[key] = pygame.surfarray.make_surface(np.ascontiguousarray(pixels)).convert()
+    return gradients[key]
+
+
+# Utility function for gradient background, animated by scrolling the cached surface
 def draw_animated_gradient(color1, color2, shift=0):  # Default shift to 0 if not passed
-    step = 2
-    for y in range(0, SCREEN_HEIGHT, step):
-        ratio = (y / SCREEN_HEIGHT + shift) % 1
-        r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-        g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-        b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
-        pygame.draw.line(screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+    offset = int((shift % 1) * SCREEN_HEIGHT)
+    screen.blit(gradient_surface(color1, color2), (0, -offset))
 
 
 # Button icons
@@ -89,34 +127,16 @@ def load_game_of_life_icon():
     return icon_surface
 
 
-icons = {
-    "hangman": load_hangman_icon(),
-    "tic_tac_toe": load_tic_tac_toe_icon(),
-    "game_of_life": load_game_of_life_icon(),
-}
+icons = {}
 
 
-particles = []
+# Hover bursts and win celebrations share one particle buffer
+particle_system = particles.ParticleSystem()
 
-
-# Particle effects
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.radius = random.randint(2, 5)
-        self.color = color
-        self.vx = random.uniform(-1, 1)
-        self.vy = random.uniform(-1, -3)
-        self.life = random.randint(20, 40)
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.life -= 1
-
-    def draw(self, surface):
-        pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), self.radius)
+# Frame timings of the game loops, F3 shows them
+profiler = profiling.Profiler()
+PROFILER_REFRESH = 0.25  # Seconds between overlay updates, the numbers are rendered once per update
+profiler_overlay = {"time": 0.0, "lines": []}
 
 
 # Button class with hover effects and particles
@@ -128,10 +148,13 @@ class Button:
         self.text = text
         self.icon = icon
         self.hovered = False
+        self.just_hovered = False  # True on the frame the mouse moved onto the button
 
     def draw(self, surface):
         mouse_pos = pygame.mouse.get_pos()
         is_hovered = self.rect.collidepoint(mouse_pos)
+        self.just_hovered = is_hovered and not self.hovered
+        self.hovered = is_hovered
         color = self.hover_color if is_hovered else self.color
 
         # Hover effect (scaling)
@@ -141,7 +164,7 @@ class Button:
             pygame.draw.rect(surface, color, self.rect, border_radius=10)
 
         # Render text
-        text_surface = font.render(self.text, True, WHITE)
+        text_surface = render_text(font, self.text, WHITE)
         surface.blit(text_surface, text_surface.get_rect(center=self.rect.center))
 
         # Render icon if available
@@ -152,113 +175,219 @@ class Button:
         return self.rect.collidepoint(pos)
 
 
+# Game of Life board renderer, redraws only the cells that changed since the last frame
+class GridRenderer:
+    def __init__(self, rows, cols, cell_size, origin):
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.rect = pygame.Rect(origin[0], origin[1], cols * cell_size, rows * cell_size)
+        self.shown = None  # Cells currently on screen, None forces a full redraw
+        # Small cells are drawn from a one-pixel-per-cell surface scaled up, without borders
+        self.surface = None
+        if cell_size < 4:
+            self.surface = pygame.Surface((cols, rows), depth=8)
+            self.surface.set_palette([WHITE, BLACK])
+
+    def invalidate(self):
+        self.shown = None
+
+    def _cell_rect(self, row, col):
+        return pygame.Rect(self.rect.x + col * self.cell_size, self.rect.y + row * self.cell_size,
+                           self.cell_size, self.cell_size)
+
+    def draw(self, surface, cells, changed=None):
+        # Returns the dirty rectangles for pygame.display.update. changed is (rows, cols) of every cell that
+        # may differ from the last draw, such as engine.changed_cells() after one step; without it the
+        # whole board is compared.
+        full = self.shown is None
+        if full:
+            rows, cols = np.nonzero(np.ones_like(cells, dtype=bool))
+            self.shown = cells.copy()
+        else:
+            if changed is None:
+                changed = np.nonzero(cells != self.shown)
+            rows, cols = changed
+            self.shown[rows, cols] = cells[rows, cols]
+        if len(rows) == 0:
+            return []
+
+        if self.surface is not None:
+            # Patch the changed pixels, then blit only their bounding box
+            top, bottom = int(rows.min()), int(rows.max()) + 1
+            left, right = int(cols.min()), int(cols.max()) + 1
+            if full:
+                pygame.surfarray.blit_array(self.surface, cells.T)
+            else:
+                pixels = pygame.surfarray.pixels2d(self.surface)
+                pixels[cols, rows] = cells[rows, cols]
+                del pixels  # Unlocks the surface for the blit
+            area = self._cell_rect(top, left).union(self._cell_rect(bottom - 1, right - 1))
+            region = self.surface.subsurface((left, top, right - left, bottom - top))
+            surface.blit(pygame.transform.scale(region, area.size), area)
+            return [area]
+
+        dirty = []
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            rect = self._cell_rect(row, col)
+            pygame.draw.rect(surface, BLACK if cells[row, col] else WHITE, rect)
+            pygame.draw.rect(surface, GRAY, rect, width=1)
+            dirty.append(rect)
+        # Past a few dozen rectangles a single update of the board is cheaper
+        if full or len(dirty) > 64:
+            return [self.rect]
+        return dirty
+
+
 # Buttons
-buttons = [
-    Button(300, 150, 300, 100, RED, "Hangman", icons["hangman"]),
-    Button(300, 300, 300, 100, GREEN, "Tic Tac Toe", icons["tic_tac_toe"]),
-    Button(300, 450, 300, 100, BLUE, "Game of Life", icons["game_of_life"]),
-]
+buttons = []
 
 
-# Utility function for animated gradient
-def draw_animated_gradients(color1, color2, shift):
-    step = 2  # Adjust this value to control speed
-    for y in range(0, SCREEN_HEIGHT, step):
-        ratio = (y / SCREEN_HEIGHT + shift) % 1
-        r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-        g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-        b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
-        pygame.draw.line(screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+# Initialize Pygame, open the window and build everything that needs it
+def init_display():
+    global screen, font, small_font, overlay_font
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Game Menu")
+
+    font = pygame.font.Font(None, 50)
+    small_font = pygame.font.Font(None, 36)
+    overlay_font = pygame.font.Font(None, 22)
+    text_cache.clear()
+
+    icons.update({
+        "hangman": load_hangman_icon(),
+        "tic_tac_toe": load_tic_tac_toe_icon(),
+        "game_of_life": load_game_of_life_icon(),
+    })
+    buttons[:] = [
+        Button(300, 150, 300, 100, RED, "Hangman", icons["hangman"]),
+        Button(300, 300, 300, 100, GREEN, "Tic Tac Toe", icons["tic_tac_toe"]),
+        Button(300, 450, 300, 100, BLUE, "Game of Life", icons["game_of_life"]),
+    ]
+
+
+# Scores are appended to a JSON Lines log, the old scores.json is migrated on first use.
+# The writer thread does the disk work so the game loop only queues them.
+score_log = scoreboard.ScoreLog()
+score_writer = scoreboard.ScoreWriter(score_log)
+atexit.register(score_writer.close)
+
+
+# Keeps a result screen on for a few seconds, with a particle burst for a win
+def celebrate(draw_screen, seconds, burst_color=None):
+    clock = frames.FrameClock(profiler=profiler)
+    if burst_color:
+        particle_system.emit(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, 20000, burst_color, speed=400, life=(0.8, 2.0))
+    end = time.time() + seconds
+    while time.time() < end:
+        for event in clock.tick():
+            if event.type == pygame.QUIT:
+                quit_game()
+        draw_screen()
+        profiler.lap("draw")
+        particle_system.update(clock.dt)
+        particle_system.draw(screen)
+        profiler.lap("particles")
+        draw_profiler(screen)
+        pygame.display.flip()
+        profiler.lap("flip")
+    particle_system.clear()
 
 
-# Save score function
 def load_scores():
-    try:
-        with open("Assets/scores.json", "r") as file:
-            scores = json.load(file)
-            # Ensure the scores are in dictionary format
-            if isinstance(scores, list):
-                # Convert list to dictionary (legacy support)
-                scores_dict = {}
-                for score_entry in scores:
-                    game_name = score_entry.get('game')
-                    if game_name:
-                        if game_name not in scores_dict:
-                            scores_dict[game_name] = []
-                        scores_dict[game_name].append(score_entry)
-                return scores_dict
-            elif isinstance(scores, dict):
-                return scores
-            return {}
-    except FileNotFoundError:
-        # If the file doesn't exist, return an empty dictionary
-        return {}
-    except json.JSONDecodeError as e:
-        print(f"Error reading scores.json: {e}. Creating a new file.")
-        # Create a new empty file if there was an error
-        with open("Assets/scores.json", "w") as file:
-            json.dump({}, file)
-        return {}
+    with profiler.scope("scores"):
+        score_writer.flush()
+        return score_log.all()
 
 
 def save_score(game_name, time_taken, result):
-    # Load current scores
-    scores = load_scores()
-
-    # If the game doesn't exist in the scores dictionary, initialize it
-    if game_name not in scores:
-        scores[game_name] = []
-
-    # Append the new score entry to the game's list
-    scores[game_name].append({
-        "time": time_taken,
-        "result": result,
-        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
-    })
-
-    # Write the updated scores back to the file
-    with open("Assets/scores.json", "w") as file:
-        json.dump(scores, file, indent=4)
+    with profiler.scope("scores"):
+        score_writer.submit(game_name, time_taken, result)
 
 
-# Show saved scores (Display after each game)
-def display_scores(game_name):
-    scores = load_scores().get(game_name, [])
-    if scores:
-        score_text = f"{game_name} High Scores:"
-        for score in scores:
-            score_text += f"\n{score['timestamp']} - {score['result']} - Time: {score['time']}s"
-        return score_text
-    return f"No scores for {game_name}"
+# Profiler overlay in the bottom left corner; returns the area drawn, None while the profiler is off
+def draw_profiler(surface):
+    if not profiler.enabled:
+        return None
+    now = time.perf_counter()
+    if now - profiler_overlay["time"] > PROFILER_REFRESH:
+        profiler_overlay["time"] = now
+        profiler_overlay["lines"] = [overlay_font.render(line, True, WHITE) for line in profiler.report()]
+    lines = profiler_overlay["lines"]
+    area = pygame.Rect(0, SCREEN_HEIGHT - 170, 340, 170)
+    surface.fill(BLACK, area)
+    for number, line in enumerate(lines[:8]):
+        surface.blit(line, (8, area.y + 8 + 20 * number))
+    return area
+
+
+# Closing the window: write the queued scores before leaving
+def quit_game():
+    score_writer.close()
+    pygame.quit()
+    sys.exit()
+
+
+# Show saved scores (Display after each game), one page of the history at a time
+def display_scores(game_name, page=0, page_size=10):
+    stats = score_log.stats(game_name)
+    if not stats.count:
+        return f"No scores for {game_name}"
+    score_text = f"{game_name} High Scores:"
+    score_text += (f"\n{stats.count} games, {stats.win_rate:.0%} won, "
+                   f"median {stats.percentile(50):.1f}s, 90th percentile {stats.percentile(90):.1f}s")
+    for seconds, timestamp in score_log.leaderboard(game_name, 3):
+        score_text += f"\nFastest win: {seconds:.1f}s on {timestamp}"
+    for score in score_log.page(game_name, page, page_size):
+        score_text += f"\n{score['timestamp']} - {score['result']} - Time: {score['time']}s"
+    return score_text
 
 
 # Return to menu button
 return_button = Button(650, 10, 140, 50, GRAY, "Menu")
 
 
-# Hangman function
-def run_hangman():
-    # Function to load words from a file
-    def load_words(filename="Assets/hangman_data.txt"):
-        try:
-            with open(filename, "r") as file:
-                words = file.read().splitlines()
-            return [word.strip().upper() for word in words if word.strip()]
-        except FileNotFoundError:
-            print(f"File {filename} not found!")
-            return ["PYTHON", "HANGMAN", "COMPUTER"]  # Default words if the file does not exist
+# Word index of a dictionary file, loaded once and cached
+def load_word_index(filename=words.WORDS_FILE):
+    try:
+        return words.load_index(filename)
+    except FileNotFoundError:
+        print(f"File {filename} not found!")
+        return words.WordIndex.from_words(words.DEFAULT_WORDS)  # Default words if the file does not exist
+
+
+# Function to load words from a file
+def load_words(filename=words.WORDS_FILE):
+    try:
+        return list(words.load_index(filename))
+    except FileNotFoundError:
+        print(f"File {filename} not found!")
+        return list(words.DEFAULT_WORDS)
 
+
+def get_display_word(word, guessed_letters):
+    return " ".join(letter if letter in guessed_letters else "_" for letter in word)
+
+
+# Hangman function
+def run_hangman(length=None, difficulty=None):
     # Load words from file
-    word_list = load_words()
+    word_index = load_word_index()
+    hint_button = Button(650, 70, 140, 50, GRAY, "Hint")
+    solver = None  # Built on the first hint
+    clock = frames.FrameClock(profiler=profiler)
 
     while True:
-        guessed_word = random.choice(word_list)  # Randomly select a new word from the list
+        guessed_word = word_index.choice(length, difficulty)  # Randomly select a new word from the list
         running = True
         screen.fill((0, 0, 0))
         display_word = "_ " * len(guessed_word)
         guessed_letters = []
         attempts = 6  # Number of attempts
         start_time = time.time()
+        hint_state = None  # Candidate words left, narrowed after every guess once a hint was asked for
+        hint = None
 
         def draw_hangman(attempts_):
             static_parts = [
@@ -287,57 +416,76 @@ def run_hangman():
                     pygame.draw.line(screen, BLACK, dynamic_parts[i][0], dynamic_parts[i][1], 5)
 
         def end_message(won):
-            screen.fill(LIGHT_GRAY)
-            message = "You won!" if won else "You lost!"
-            title_ = font.render(message, True, GREEN if won else RED)
-            screen.blit(title_, title_.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50)))
+            def draw_message():
+                screen.fill(LIGHT_GRAY)
+                message = "You won!" if won else "You lost!"
+                title_ = render_text(font, message, GREEN if won else RED)
+                screen.blit(title_, title_.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50)))
 
-            correct_word = font.render(f"The word was: {guessed_word}", True, BLACK)
-            screen.blit(correct_word, correct_word.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)))
+                correct_word = render_text(font, f"The word was: {guessed_word}", BLACK)
+                screen.blit(correct_word, correct_word.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)))
 
-            pygame.display.flip()
-            time.sleep(3)
-
-            # Save the score
+            # Save the score first, closing the window during the result screen must not lose it
             end_time_ = time.time()
             result = "Win" if won else "Loss"
             save_score("Hangman", end_time_ - start_time, result)
 
+            celebrate(draw_message, 3, GREEN if won else None)
+
         while running:
             screen.fill(LIGHT_BLUE)
 
-            title = font.render("Hangman", True, BLACK)
+            title = render_text(font, "Hangman", BLACK)
             screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, 50)))
 
             return_button.draw(screen)
+            hint_button.draw(screen)
+            if hint:
+                hint_surface = render_text(small_font, f"Hint: {hint}", BLACK)
+                screen.blit(hint_surface, (50, 90))
 
             # Draw the word to guess on the right side
-            word_surface = font.render(display_word, True, BLACK)
+            word_surface = render_text(font, display_word, BLACK)
             screen.blit(word_surface, word_surface.get_rect(center=(600, 200)))
 
             # Display attempts left
-            attempts_surface = small_font.render(f"Attempts left: {attempts}", True, RED)
+            attempts_surface = render_text(small_font, f"Attempts left: {attempts}", RED)
             screen.blit(attempts_surface, (50, 50))
 
             # Draw the hangman on the left
             draw_hangman(attempts)
+            draw_profiler(screen)
+            profiler.lap("draw")
 
-            for event in pygame.event.get():
+            # Nothing moves between key presses, so the loop sleeps until the next event
+            for event in clock.tick(animating=False):
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                    quit_game()
                 if event.type == pygame.KEYDOWN:
-                    if event.unicode.upper() in guessed_word and event.unicode.upper() not in guessed_letters:
-                        guessed_letters.append(event.unicode.upper())
-                        display_word = " ".join([
-                            letter if letter in guessed_letters else "_" for letter in guessed_word
-                        ])
-                    elif event.unicode.upper() not in guessed_letters and event.unicode.isalpha():
-                        guessed_letters.append(event.unicode.upper())
+                    letter = event.unicode.upper()
+                    if letter in guessed_word and letter not in guessed_letters:
+                        guessed_letters.append(letter)
+                        display_word = get_display_word(guessed_word, guessed_letters)
+                    elif letter not in guessed_letters and event.unicode.isalpha():
+                        guessed_letters.append(letter)
                         attempts -= 1
+                    else:
+                        continue
+                    hint = None
+                    if hint_state:
+                        hint_state.guess(letter, hangman_solver.letter_mask(guessed_word, letter))
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1 and return_button.is_clicked(event.pos):
                         return
+                    if event.button == 1 and hint_button.is_clicked(event.pos):
+                        if solver is None:
+                            solver = hangman_solver.HangmanSolver(word_index)
+                        if hint_state is None:
+                            hint_state = solver.start(len(guessed_word))
+                            for letter in guessed_letters:
+                                hint_state.guess(letter, hangman_solver.letter_mask(guessed_word, letter))
+                        hint = hint_state.best_letter()
+            profiler.lap("events")
 
             if "_" not in display_word:
                 end_message(True)
@@ -347,92 +495,125 @@ def run_hangman():
                 break
 
             pygame.display.flip()
+            profiler.lap("flip")
 
 
-# Tic Tac Toe function
-def run_tic_tac_toe():
-    board: List[List[Optional[str]]] = [[None for _ in range(3)] for _ in range(3)]
-
-    assert isinstance(board, list) and all(isinstance(row, list) for row in board)
-    player = "X"
-    running = True
+# Tic Tac Toe function, N x N with k in a row, against a friend or the computer playing O
+def run_tic_tac_toe(size=3, k=3, computer=False):
+    board = tictactoe.Board(size, size, k)
+    variant_button = Button(650, 70, 140, 50, GRAY, f"{size}x{size}")
+    mode_button = Button(650, 130, 140, 50, GRAY, "vs AI" if computer else "2 Players")
+    ai = tictactoe_ai.ComputerPlayer(budget=1.0)
+    ai_position = None  # Board and move number the search was started on
+    clock = frames.FrameClock(profiler=profiler)
     start_time = time.time()
 
-    def check_winner():
-        for row in board:
-            if row[0] == row[1] == row[2] and row[0]:
-                return row[0]
-        for col_ in range(3):
-            if board[0][col_] == board[1][col_] == board[2][col_] and board[0][col_]:
-                return board[0][col_]
-        if board[0][0] == board[1][1] == board[2][2] and board[0][0]:
-            return board[0][0]
-        if board[0][2] == board[1][1] == board[2][0] and board[0][2]:
-            return board[0][2]
-        return None
-
     def display_winner(winner_):
-        screen.fill(LIGHT_GRAY)
-        title_ = font.render(f"{winner_} Wins!" if winner_ else "Draw!", True, BLACK)
-        screen.blit(title_, title_.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
-        pygame.display.flip()
-        time.sleep(2)
+        def draw_result():
+            screen.fill(LIGHT_GRAY)
+            title_ = render_text(font, f"{winner_} Wins!" if winner_ else "Draw!", BLACK)
+            screen.blit(title_, title_.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
 
-        # Save the score
+        # Save the score first, closing the window during the result screen must not lose it
         end_time_ = time.time()
         result = f"{winner_} Wins" if winner_ else "Draw"
         save_score("Tic Tac Toe", end_time_ - start_time, result)
 
-    while running:
-        screen.fill((0, 0, 0))
+        celebrate(draw_result, 2, (RED if winner_ == tictactoe.MARKS[0] else BLUE) if winner_ else None)
+
+    while True:
+        # The 3x3 board keeps its 100 px cells, larger ones shrink to fit
+        cell_size = min(100, 380 // board.cols)
+        left = top = 350 - cell_size * board.cols // 2
+        mark_font = font if cell_size >= 60 else small_font
+
         screen.fill(LIGHT_BLUE)
 
-        title = font.render("Tic Tac Toe", True, BLACK)
+        title = render_text(font, "Tic Tac Toe" if board.k == 3 else f"Tic Tac Toe, {board.k} in a row", BLACK)
         screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, 50)))
 
         return_button.draw(screen)
-
-        for row in range(3):
-            for col in range(3):
-                rect = pygame.Rect(200 + col * 100, 200 + row * 100, 100, 100)
-                pygame.draw.rect(screen, BLACK, rect, width=3)
-                if board[row][col]:
-                    mark = font.render(board[row][col], True, RED if board[row][col] == "X" else BLUE)
+        variant_button.draw(screen)
+        mode_button.draw(screen)
+
+        for row in range(board.rows):
+            for col in range(board.cols):
+                rect = pygame.Rect(left + col * cell_size, top + row * cell_size, cell_size, cell_size)
+                pygame.draw.rect(screen, BLACK, rect, width=3 if cell_size >= 60 else 1)
+                player = board.cell(row, col)
+                if player is not None:
+                    mark = render_text(mark_font, tictactoe.MARKS[player], RED if player == 0 else BLUE)
                     screen.blit(mark, mark.get_rect(center=rect.center))
 
-        winner = check_winner()
-        if winner or all(cell is not None for row in board for cell in row):
-            display_winner(winner)
+        # The search runs on its own thread, the board is drawn meanwhile
+        if computer and board.player == 1 and not board.is_over:
+            if ai_position != (board, len(board.moves)):
+                ai.start(board)
+                ai_position = (board, len(board.moves))
+            move = ai.poll()
+            if move is not None:
+                board.play_index(move)
+                clock.wake()  # The move came from the search thread, not from an event
+            else:
+                thinking = render_text(small_font, "Thinking...", BLACK)
+                screen.blit(thinking, thinking.get_rect(center=(SCREEN_WIDTH // 2, 100)))
+        draw_profiler(screen)
+        profiler.lap("draw")
+
+        # The board only changes on a move, so the result is only checked after one
+        if board.is_over:
+            pygame.display.flip()
+            display_winner(None if board.winner is None else tictactoe.MARKS[board.winner])
             return
 
-        for event in pygame.event.get():
+        # Frames are only needed until the computer's move is polled, otherwise the loop waits for input.
+        # Not ai.thinking: the search can finish after the poll above and would then never be picked up.
+        computer_turn = computer and board.player == 1 and not board.is_over
+        for event in clock.tick(animating=computer_turn):
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                quit_game()
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
                     if return_button.is_clicked(event.pos):
+                        ai.cancel()
                         return
+                    if variant_button.is_clicked(event.pos):
+                        # Next board size, starting a new game
+                        sizes = [variant[0] for variant in tictactoe.VARIANTS]
+                        index = (sizes.index(board.cols) + 1) % len(sizes) if board.cols in sizes else 0
+                        size, k = tictactoe.VARIANTS[index]
+                        ai.cancel()
+                        board = tictactoe.Board(size, size, k)
+                        start_time = time.time()  # The score times the new game only
+                        variant_button.text = f"{size}x{size}"
+                        continue  # The frame's other events still count
+                    if mode_button.is_clicked(event.pos):
+                        computer = not computer
+                        mode_button.text = "vs AI" if computer else "2 Players"
+                        continue
+                    if computer and board.player == 1:
+                        continue  # The computer's turn
                     x, y = event.pos
-                    col = (x - 200) // 100
-                    row = (y - 200) // 100
+                    col = (x - left) // cell_size
+                    row = (y - top) // cell_size
 
                     # Validation and attribution
-                    if isinstance(row, int) and isinstance(col, int) and 0 <= row < 3 and 0 <= col < 3:
-                        if board[row][col] is None:
-                            board[row][col] = player
-                            player = "O" if player == "X" else "X"
-                        else:
-                            pass
+                    if 0 <= row < board.rows and 0 <= col < board.cols and board.cell(row, col) is None:
+                        board.play(row, col)
+                        if board.is_over:
+                            break
+        profiler.lap("events")
 
         pygame.display.flip()
+        profiler.lap("flip")
 
 
 # Game of Life function
-def run_game_of_life():
-    grid_size = 20
-    cell_size = 20
-    grid = [[0 for _ in range(grid_size)] for _ in range(grid_size)]
+def run_game_of_life(grid_size=20, cell_size=20, pattern=None, generations_per_second=10, rule=None):
+    engine = life.make_engine("numpy", grid_size, grid_size, rule=rule)
+    if pattern:
+        patterns.load_pattern(pattern, engine)
+    grid = engine.cells
     running = True
     simulation_running = False
     start_time = time.time()
@@ -440,52 +621,67 @@ def run_game_of_life():
     # Creating a Start button
     start_button = Button(300, 500, 200, 50, GREEN, "Start", hover_color=LIGHT_BLUE)
 
-    def draw_grid():
-        for row_2 in range(grid_size):
-            for col_1 in range(grid_size):
-                color = BLACK if grid[row_2][col_1] else WHITE
-                rect = pygame.Rect(50 + col_1 * cell_size, 50 + row_2 * cell_size, cell_size, cell_size)
-                pygame.draw.rect(screen, color, rect)
-                pygame.draw.rect(screen, GRAY, rect, width=1)
-
-    def update_grid():
-        new_grid = [[0 for _ in range(grid_size)] for _ in range(grid_size)]
-        for row_1 in range(grid_size):
-            for col_2 in range(grid_size):
-                neighbors = sum(
-                    grid[(row_1 + dr) % grid_size][(col_2 + dc) % grid_size]
-                    for dr in (-1, 0, 1)
-                    for dc in (-1, 0, 1)
-                    if not (dr == 0 and dc == 0)
-                )
-                if grid[row_1][col_2] == 1 and neighbors in (2, 3):
-                    new_grid[row_1][col_2] = 1
-                elif grid[row_1][col_2] == 0 and neighbors == 3:
-                    new_grid[row_1][col_2] = 1
-        return new_grid
+    renderer = GridRenderer(grid_size, grid_size, cell_size, (50, 50))
+    detector = cycles.CycleDetector(history=256)
+    clock = frames.FrameClock(profiler=profiler)
+    overlay_area = None
+    changed = None  # Cells to redraw on the next frame, None compares the whole board
+    unchanged = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp))
+    ticker = frames.Ticker(generations_per_second)  # Generation rate independent of the frame rate
 
-    while running:
-        screen.fill(LIGHT_BLUE)
+    # Static parts are drawn once, later frames only update what changed
+    screen.fill(LIGHT_BLUE)
 
-        # Game's Title
-        title = font.render("Game of Life", True, BLACK)
-        screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, 20)))
+    # Game's Title
+    title = render_text(font, "Game of Life" if engine.rule.is_conway else f"Game of Life {engine.rule}", BLACK)
+    screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, 20)))
+    pygame.display.flip()
 
-        # Buttons
-        return_button.draw(screen)
-        start_button.draw(screen)
+    while running:
+        dirty = []
 
-        # Drawing a grid
-        draw_grid()
+        # Buttons
+        for button in (return_button, start_button):
+            area = button.rect.inflate(10, 10)
+            screen.fill(LIGHT_BLUE, area)
+            button.draw(screen)
+            dirty.append(area)
+
+        # Drawing the cells that changed
+        dirty.extend(renderer.draw(screen, grid, changed))
+
+        # The overlay covers part of the board, which is redrawn in full once it is gone
+        area = draw_profiler(screen)
+        if area:
+            dirty.append(area)
+        elif overlay_area:
+            screen.fill(LIGHT_BLUE, overlay_area)
+            dirty.append(overlay_area)
+            renderer.invalidate()
+        overlay_area = area
+        profiler.lap("draw")
 
         # If the simulation is running, update the mesh state
+        # One generation flips only the cells the engine reports, several need a full comparison
+        changed = unchanged
         if simulation_running:
-            grid[:] = update_grid()
-
-        for event in pygame.event.get():
+            steps = ticker.advance(clock.dt)
+            for stepped in range(1, steps + 1):
+                engine.step()
+                # Nothing will change any more once the board is empty or still
+                cycle = detector.observe(engine)
+                if cycle and cycle.period == 1:
+                    simulation_running = False
+                    steps = stepped
+                    break
+            if steps:
+                changed = engine.changed_cells() if steps == 1 else None
+            profiler.count("generations", steps)
+            profiler.lap("step")
+
+        for event in clock.tick(animating=simulation_running):
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                quit_game()
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
                     if return_button.is_clicked(event.pos):
@@ -494,15 +690,26 @@ def run_game_of_life():
                         return
                     if start_button.is_clicked(event.pos):
                         simulation_running = not simulation_running
+                        if simulation_running:
+                            detector.reset(engine)
+                            ticker.reset()
                     x, y = event.pos
                     col = (x - 50) // cell_size
                     row = (y - 50) // cell_size
                     if 0 <= row < grid_size and 0 <= col < grid_size and not simulation_running:
-                        grid[row][col] = 1 - grid[row][col]
+                        engine.toggle(row, col)
+                        changed = None
+        profiler.lap("events")
+
+        pygame.display.update(dirty)
+        profiler.lap("flip")
 
-        pygame.display.flip()
-        time.sleep(0.1)
 
+# Pure helpers stay reachable from the game functions that use them
+run_hangman.load_words = load_words
+run_hangman.get_display_word = get_display_word
+run_tic_tac_toe.check_winner = tictactoe.check_winner
+run_game_of_life.update_grid = life.update_grid
 
 # Map games
 games = {
@@ -524,29 +731,49 @@ def main_menu():
     running = True
     angle = 0
     gradient_shift = 0  # Shift variable for gradient animation
+    clock = frames.FrameClock(profiler=profiler)
+    rotated_titles = {}
     while running:
-        screen.fill((0, 0, 0))
         gradient_shift += 0.002  # Adjust speed as necessary
 
-        draw_animated_gradients(LIGHT_BLUE, BLUE, gradient_shift)
-        angle += 1
-        rotated_title = pygame.transform.rotate(font.render("Game Menu", True, YELLOW),
-                                                math.sin(math.radians(angle)) * 5)
+        draw_animated_gradient(LIGHT_BLUE, BLUE, gradient_shift)
+        angle = (angle + 1) % 360
+        # The wobble repeats every 360 frames, so each rotation is only computed once
+        if angle not in rotated_titles:
+            rotated_titles[angle] = pygame.transform.rotate(render_text(font, "Game Menu", YELLOW),
+                                                            math.sin(math.radians(angle)) * 5)
+        rotated_title = rotated_titles[angle]
         screen.blit(rotated_title, rotated_title.get_rect(center=(SCREEN_WIDTH // 2, 50)))
 
         for button in buttons:
             button.draw(screen)
-
+            if button.just_hovered:
+                particle_system.emit(*button.rect.center, 300, button.hover_color)
+        profiler.lap("draw")
+
+        particle_system.update(clock.dt)
+        particle_system.draw(screen)
+        profiler.lap("particles")
+        draw_profiler(screen)
         pygame.display.flip()
+        profiler.lap("flip")
 
-        for event in pygame.event.get():
+        for event in clock.tick():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                quit_game()
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 for button in buttons:
                     if button.is_clicked(event.pos):
                         games[button.text]()
 
 
-main_menu()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Game menu")
+    parser.add_argument("--profile", metavar="TRACE",
+                        help="Start with the profiler on and write its trace to TRACE (.csv or .json) on exit")
+    args = parser.parse_args()
+    if args.profile:
+        profiler.toggle()
+        atexit.register(profiler.export, args.profile)
+    init_display()
+    main_menu()
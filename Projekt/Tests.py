@@ -1,15 +1,28 @@
-import os
+import json
+import random
+import time
 from pathlib import Path
+import numpy as np
+import pygame
 import pytest
-from Project import run_hangman, run_tic_tac_toe, run_game_of_life, Button
-
-
-# ---------- Fixtures ----------
-@pytest.fixture(autouse=True)
-def cleanup_files():
-    yield
-    if os.path.exists("Assets/scores.json"):
-        os.remove("Assets/scores.json")
+import benchmarks
+import checkpoint
+import cycles
+import frames
+import hangman_solver
+import hashlife
+import headless
+import life
+import particles
+import patterns
+import profiling
+import rules
+import scoreboard
+import tictactoe
+import tictactoe_ai
+import words
+import Project
+from Project import run_hangman, run_tic_tac_toe, run_game_of_life, Button, GridRenderer
 
 
 # ---------- Hangman Tests ----------
@@ -33,6 +46,34 @@ def test_hangman_display() -> None:
     assert display == "P Y _ _ _ _", "Should reveal guessed letters"
 
 
+def test_word_index_filters_and_binary_form(tmp_path) -> None:
+    """Test words are picked by length and difficulty, also from the mapped index"""
+    path = tmp_path / "words.txt"
+    path.write_text("tree\nsea\neaten\njazz\nquiz\nfuzzy\nTree\n\n")
+    index = words.load_index(str(path))
+    assert len(index) == 6, "Blank lines and duplicates should be dropped"
+    assert words.load_index(str(path)) is index, "The index should be cached"
+    assert index.count(length=4) == 3
+    assert {index.choice(difficulty=words.HARD) for _ in range(50)} <= {"JAZZ", "QUIZ", "FUZZY"}
+    mapped = words.open_index(str(path) + words.INDEX_SUFFIX)
+    assert sorted(mapped) == sorted(index)
+    assert mapped.choice(length=3) == "SEA"
+    with pytest.raises(IndexError):
+        mapped.choice(length=9)
+
+
+def test_hangman_solver_hint_and_bot() -> None:
+    """Test hints narrow the candidates and the bot solves dictionary words"""
+    solver = hangman_solver.HangmanSolver(["CAT", "CAR", "BAT", "DOG", "TREE"])
+    assert solver.hint("_ _ _", []) == "A", "A is in most three-letter words"
+    assert solver.hint("_ A _", ["A", "T"]) in ("C", "R"), "Only CAR is left after missing T"
+    state = solver.start(3)
+    state.guess("A", 0b010)
+    state.guess("T", 0b100)
+    assert sorted(state.words()) == ["BAT", "CAT"]
+    assert all(solver.play(word) < hangman_solver.MAX_MISSES for word in ["CAT", "CAR", "BAT", "DOG", "TREE"])
+
+
 # ---------- Game of Life Tests ----------
 def test_game_of_life_update() -> None:
     """Test grid update rules"""
@@ -45,6 +86,355 @@ def test_game_of_life_update() -> None:
     assert isinstance(updated_grid, list), "Should return a 2D grid"
 
 
+@pytest.mark.parametrize("name, options", [("numpy", {}), ("sparse", {}), ("bitpacked", {}),
+                                           ("parallel", {"workers": 2, "tiles": 4})])
+def test_engine_matches_list_engine(name, options) -> None:
+    """Test an engine steps exactly like the reference rule, wrapped and with fixed edges"""
+    rng = random.Random(7)
+    # Widths around the 64-bit words of the bit-packed engine
+    for rows, cols in ((13, 17), (9, 5), (9, 64), (15, 130)):
+        for wrap in (True, False):
+            grid = [[int(rng.random() < 0.35) for _ in range(cols)] for _ in range(rows)]
+            reference = life.make_engine("list", rows, cols, wrap, grid)
+            engine = life.make_engine(name, rows, cols, wrap, grid, **options)
+            try:
+                for _ in range(15):
+                    reference.step()
+                    engine.step()
+                    assert engine.to_list() == reference.to_list(), f"{name} should agree on {rows}x{cols}"
+                assert engine.population == reference.population
+                array = engine.to_array()
+                assert array.tolist() == reference.to_list()
+                array ^= 1
+                assert engine.to_list() == reference.to_list(), "to_array should return a copy"
+            finally:
+                if hasattr(engine, "close"):
+                    engine.close()
+
+
+def test_fixed_boundary_blinker() -> None:
+    """Test cells pushed past the edge are lost without wrapping"""
+    engine = life.make_engine("numpy", 3, 3, wrap=False, grid=[[1, 1, 1], [0, 0, 0], [0, 0, 0]])
+    engine.step()
+    assert engine.to_list() == [[0, 1, 0], [0, 1, 0], [0, 0, 0]], "Cells outside the board should be dead"
+
+
+def test_hashlife_matches_numpy_engine() -> None:
+    """Test HashLife jumps agree with single steps on an unbounded board"""
+    rng = random.Random(11)
+    grid = [[0] * 64 for _ in range(64)]
+    for row in range(26, 38):
+        for col in range(26, 38):
+            grid[row][col] = int(rng.random() < 0.4)
+    reference = life.make_engine("numpy", 64, 64, wrap=False, grid=grid)
+    engine = hashlife.HashLifeEngine(64, 64)
+    engine.load(grid)
+    for generations in (1, 2, 5, 8):
+        reference.step(generations)
+        engine.step(generations)
+        assert engine.to_list() == reference.to_list(), "HashLife should match the step-by-step result"
+
+
+def test_hashlife_glider_jump() -> None:
+    """Test a glider travels one cell diagonally every 4 generations"""
+    engine = hashlife.HashLifeEngine(8, 8, max_nodes=1000)
+    engine.load([[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+    engine.step(4 * 10**6)
+    assert engine.generation == 4 * 10**6
+    assert sorted(engine.live_cells()) == [(10**6, 10**6 + 1), (10**6 + 1, 10**6 + 2),
+                                           (10**6 + 2, 10**6), (10**6 + 2, 10**6 + 1),
+                                           (10**6 + 2, 10**6 + 2)], "Glider should have moved 10**6 cells"
+
+
+def test_hashlife_set_runs_matches_set_cell() -> None:
+    """Test batched runs build the same universe as single cells, also around existing ones"""
+    rng = np.random.default_rng(8)
+    rows, cols = rng.integers(-150, 150, 400), rng.integers(-150, 150, 400)
+    lengths = rng.integers(1, 40, 400)
+    engine = hashlife.HashLifeEngine(16, 16)
+    engine.set_cell(3, 3, 1)
+    reference = hashlife.HashLifeEngine(16, 16)
+    reference.set_cell(3, 3, 1)
+    for first in (0, 200):
+        engine.set_runs(rows[first:first + 200], cols[first:first + 200], lengths[first:first + 200])
+    for row, col, length in zip(rows.tolist(), cols.tolist(), lengths.tolist()):
+        for c in range(col, col + length):
+            reference.set_cell(row, c, 1)
+    assert sorted(engine.live_cells()) == sorted(reference.live_cells())
+    assert engine.population == reference.population
+
+
+def test_hashlife_budget_holds_within_a_jump() -> None:
+    """Test the node and result caches stay near max_nodes during one long jump"""
+    rng = random.Random(5)
+    grid = [[int(rng.random() < 0.35) for _ in range(32)] for _ in range(32)]
+    reference = hashlife.HashLifeEngine(32, 32)
+    reference.load(grid)
+    reference.step(64)
+    engine = hashlife.HashLifeEngine(32, 32, max_nodes=3000)
+    engine.load(grid)
+    successor, peak = engine._successor, []
+
+    def tracked(m, j):
+        result = successor(m, j)
+        peak.append(max(len(engine._nodes), len(engine._results)))
+        return result
+
+    engine._successor = tracked
+    engine.step(64)
+    assert max(peak) <= 3000 + 20, "The caches should be collected in the middle of a jump"
+    assert sorted(engine.live_cells()) == sorted(reference.live_cells()), "Collecting should not change the result"
+
+
+def test_sparse_engine_unbounded() -> None:
+    """Test a glider keeps flying past the window of an unbounded universe"""
+    engine = life.make_engine("sparse", 4, 4, grid=[[0, 1, 0], [0, 0, 1], [1, 1, 1]], unbounded=True)
+    engine.step(400)
+    assert engine.population == 5, "Glider should survive off the board"
+    assert min(engine.live_cells()) == (100, 101), "Glider should have moved 100 cells"
+
+
+def test_grid_renderer_dirty_cells() -> None:
+    """Test only flipped cells are redrawn after the first frame"""
+    surface = pygame.Surface((200, 200))
+    renderer = GridRenderer(5, 5, 20, (10, 10))
+    cells = np.zeros((5, 5), dtype=np.uint8)
+    assert renderer.draw(surface, cells) == [pygame.Rect(10, 10, 100, 100)], "First frame draws the board"
+    assert renderer.draw(surface, cells) == [], "Unchanged board needs no update"
+    cells[2, 3] = 1
+    assert renderer.draw(surface, cells) == [pygame.Rect(70, 50, 20, 20)], "Only the flipped cell is dirty"
+    assert surface.get_at((80, 60))[:3] == (0, 0, 0), "Live cell should be drawn black"
+
+
+def test_grid_renderer_engine_changes() -> None:
+    """Test drawing only the engine's changed cells gives the same picture as a full redraw"""
+    for cell_size in (2, 6):
+        engine = life.make_engine("numpy", 40, 40, grid=np.random.default_rng(6).random((40, 40)) < 0.3)
+        patched, full = pygame.Surface((300, 300)), pygame.Surface((300, 300))
+        renderer = GridRenderer(40, 40, cell_size, (10, 10))
+        renderer.draw(patched, engine.cells)
+        for _ in range(5):
+            engine.step()
+            renderer.draw(patched, engine.cells, engine.changed_cells())
+        GridRenderer(40, 40, cell_size, (10, 10)).draw(full, engine.cells)
+        assert pygame.image.tobytes(patched, "RGB") == pygame.image.tobytes(full, "RGB"), f"{cell_size} px cells"
+        assert renderer.draw(patched, engine.cells) == [], "The renderer should know what is on screen"
+
+
+def test_headless_life_run(capsys) -> None:
+    """Test the headless runner reports generations per second"""
+    assert headless.main(["life", "--size", "32", "--generations", "5", "--engine", "bitpacked"]) == 0
+    assert "gen/s" in capsys.readouterr().out, "Should report the simulation speed"
+
+
+def test_rle_round_trip(tmp_path) -> None:
+    """Test RLE and plaintext snapshots load back into every dense backend"""
+    rng = random.Random(1)
+    grid = [[int(rng.random() < 0.3) for _ in range(90)] for _ in range(12)]
+    grid[0][0] = grid[-1][-1] = 1
+    source = life.make_engine("numpy", 12, 90, grid=grid)
+    for name in ("pattern.rle", "pattern.cells"):
+        path = str(tmp_path / name)
+        patterns.save_pattern(source, path)
+        for backend in ("list", "numpy", "sparse", "bitpacked"):
+            engine = patterns.load_pattern(path, backend)
+            assert engine.to_list() == grid, f"{name} should round-trip through {backend}"
+
+
+def test_rle_streaming_chunks(tmp_path, monkeypatch) -> None:
+    """Test counts split across read chunks and lines are decoded"""
+    path = tmp_path / "glider.rle"
+    path.write_text("#N Glider\nx = 13, y = 3, rule = B3/S23\nbo$2bo10$\n3o!\n")
+    monkeypatch.setattr(patterns, "CHUNK_SIZE", 2)
+    engine = patterns.load_pattern(str(path), "sparse", rows=3, cols=13, unbounded=True)
+    assert sorted(engine.live_cells()) == [(0, 1), (1, 2), (11, 0), (11, 1), (11, 2)], "Runs should survive chunk edges"
+
+
+def test_checkpoint_resume(tmp_path) -> None:
+    """Test a run resumed from its newest checkpoint continues identically"""
+    rng = random.Random(2)
+    grid = [[int(rng.random() < 0.3) for _ in range(70)] for _ in range(20)]
+    engine = life.make_engine("bitpacked", 20, 70, grid=grid)
+    checkpointer = checkpoint.Checkpointer(str(tmp_path), every=5, keep=2)
+    for _ in range(12):
+        engine.step()
+        checkpointer.maybe_save(engine)
+        checkpointer.flush()
+    checkpointer.close()
+    assert len(checkpoint.checkpoint_paths(str(tmp_path))) == 2, "Old checkpoints should be pruned"
+
+    resumed = checkpoint.resume(str(tmp_path), "numpy")
+    assert resumed.generation == 11
+    engine.step(9)
+    resumed.step(10)
+    assert resumed.to_list() == engine.to_list(), "Resumed run should match the original"
+
+
+def test_checkpoint_skips_corrupted_file(tmp_path) -> None:
+    """Test a truncated newest checkpoint falls back to the previous one"""
+    engine = life.make_engine("sparse", 10, 10, grid=[[0, 1, 0], [0, 0, 1], [1, 1, 1]], unbounded=True)
+    for generation in (4, 8):
+        engine.step(4)
+        path = tmp_path / checkpoint.NAME_FORMAT.format(generation)
+        checkpoint.write_snapshot(checkpoint.take_snapshot(engine), str(path))
+    with open(path, "r+b") as file:
+        file.truncate(checkpoint.HEADER.size + 2)
+    resumed = checkpoint.resume(str(tmp_path), "sparse")
+    assert resumed.generation == 4 and resumed.unbounded
+    assert sorted(resumed.live_cells()) == [(1, 2), (2, 3), (3, 1), (3, 2), (3, 3)]
+
+
+def test_checkpoint_keeps_rule(tmp_path) -> None:
+    """Test a resumed board keeps the rule it was saved with and refuses another one"""
+    engine = life.make_engine("numpy", 12, 12, grid=[[int(i * j % 3 == 1) for j in range(12)] for i in range(12)],
+                              rule="highlife")
+    engine.step(3)
+    checkpoint.write_snapshot(checkpoint.take_snapshot(engine), str(tmp_path / checkpoint.NAME_FORMAT.format(3)))
+    resumed = checkpoint.resume(str(tmp_path), "bitpacked")
+    assert resumed.rule.rulestring == "B36/S23"
+    assert checkpoint.resume(str(tmp_path), "numpy", rule="b36s23").rule.rulestring == "B36/S23"
+    engine.step(5)
+    resumed.step(5)
+    assert resumed.to_list() == engine.to_list(), "Resumed HighLife should not continue as Conway's Life"
+    with pytest.raises(ValueError):
+        checkpoint.resume(str(tmp_path), "numpy", rule="B3/S23")
+
+
+def test_cycle_detector_blinker() -> None:
+    """Test a blinker is found as a period 2 oscillator by every engine"""
+    for name in ("list", "numpy", "sparse", "bitpacked"):
+        grid = [[0] * 8 for _ in range(8)]
+        grid[3][2:5] = [1, 1, 1]
+        engine = life.make_engine(name, 8, 8, grid=grid)
+        detector = cycles.CycleDetector()
+        detector.reset(engine)
+        assert engine.changed_cells() is None, f"{name} has no previous generation before the first step"
+        engine.step()
+        while not detector.observe(engine):
+            engine.step()
+        assert detector.cycle == cycles.Cycle("oscillator", 0, 2), f"{name} blinker should repeat every 2"
+
+
+def test_cycle_detector_extinction(capsys) -> None:
+    """Test a dying board stops the headless run early"""
+    engine = life.make_engine("numpy", 6, 6)
+    engine.set_run(2, 2, 2)
+    detector = cycles.CycleDetector()
+    detector.reset(engine)
+    engine.step()
+    assert detector.observe(engine) == cycles.Cycle("extinct", 1, 1)
+    headless.main(["life", "--size", "16", "--density", "0.05", "--generations", "100000", "--cycles", "stop"])
+    assert "generation" in capsys.readouterr().out.splitlines()[0], "Should report where the cycle starts"
+
+
+def test_rule_parsing_and_engines(tmp_path) -> None:
+    """Test rulestrings compile to the same tables and every engine follows them"""
+    assert rules.parse_rule("b36/s23") == rules.parse_rule("23/36") == rules.parse_rule("HighLife")
+    assert rules.parse_rule(None).is_conway and str(rules.parse_rule("seeds")) == "B2/S"
+    with pytest.raises(ValueError):
+        rules.parse_rule("B9/S23")
+    rng = np.random.default_rng(4)
+    for rule in ("B36/S23", "B3678/S34678", "B2/S", "B0/S8"):
+        grid = (rng.random((13, 70)) < 0.4).astype(np.uint8)
+        for wrap in (True, False):
+            reference = life.make_engine("list", 13, 70, wrap, grid, rule=rule)
+            reference.step(5)
+            for backend in ("numpy", "bitpacked", "sparse"):
+                if backend == "sparse" and rule == "B0/S8":
+                    with pytest.raises(ValueError):
+                        life.make_engine(backend, 13, 70, wrap, grid, rule=rule)
+                    continue
+                engine = life.make_engine(backend, 13, 70, wrap, grid, rule=rule)
+                engine.step(5)
+                assert engine.to_list() == reference.to_list(), f"{backend} should follow {rule}"
+    engine = life.make_engine("numpy", 13, 70, grid=grid, rule="highlife")
+    path = str(tmp_path / "highlife.rle")
+    patterns.save_pattern(engine, path)
+    assert patterns.load_pattern(path, "sparse").rule == rules.parse_rule("B36/S23"), "RLE keeps the rule"
+
+
+def test_rule_batch_runner() -> None:
+    """Test batched soups match single engines and settled boards are reported"""
+    results = rules.run_batch(["daynight", "B3/S23", "B/S"], [1, 2], size=24, generations=30, batch=4)
+    assert [(result["rule"], result["seed"]) for result in results] == \
+        [(rule, seed) for rule in ("B3678/S34678", "B3/S23", "B/S") for seed in (1, 2)]
+    for result in results[:4]:
+        grid = np.random.default_rng(result["seed"]).random((24, 24)) < 0.5
+        engine = life.make_engine("numpy", 24, 24, grid=grid, rule=result["rule"])
+        engine.step(result["generation"])
+        assert engine.population == result["population"]
+    assert all(result["fate"] == "extinct" and result["generation"] == 1 for result in results[4:])
+
+
+def test_score_log_migrates_legacy_file(tmp_path) -> None:
+    """Test old scores.json entries are moved into the log and new ones appended"""
+    legacy = tmp_path / "scores.json"
+    legacy.write_text('{"Hangman": [{"time": 4.5, "result": "Loss", "timestamp": "2025-01-30 20:27:21"}]}')
+    log = scoreboard.ScoreLog(str(tmp_path / "scores.jsonl"), str(legacy))
+    log.append("Hangman", 3.0, "Win")
+    assert [entry["result"] for entry in log.scores("Hangman")] == ["Loss", "Win"]
+    reopened = scoreboard.ScoreLog(str(tmp_path / "scores.jsonl"), str(legacy))
+    assert len(reopened.scores("Hangman")) == 2, "Migration should run only once"
+
+
+def test_score_log_survives_torn_write(tmp_path) -> None:
+    """Test a half-written last line is skipped instead of wiping the scores"""
+    path = tmp_path / "scores.jsonl"
+    log = scoreboard.ScoreLog(str(path), None)
+    log.append("Tic Tac Toe", 1.0, "X wins")
+    with open(path, "ab") as file:
+        file.write(b'{"game": "Tic Tac')
+    log = scoreboard.ScoreLog(str(path), None)
+    log.append("Tic Tac Toe", 2.0, "Draw")
+    assert [entry["result"] for entry in log.scores("Tic Tac Toe")] == ["X wins", "Draw"]
+
+
+def test_score_log_leaderboard_and_pages(tmp_path) -> None:
+    """Test aggregates survive a restart and history pages come newest first"""
+    path = str(tmp_path / "scores.jsonl")
+    log = scoreboard.ScoreLog(path, None)
+    for seconds in range(1, 21):
+        log.append("Hangman", float(seconds), "Win" if seconds % 2 else "Loss", f"t{seconds}")
+    reopened = scoreboard.ScoreLog(path, None)
+    stats = reopened.stats("Hangman")
+    assert (stats.count, stats.win_rate) == (20, 0.5)
+    assert 10 <= stats.percentile(50) <= 10.5, "Median should be within a bucket of 10s"
+    assert reopened.leaderboard("Hangman", 2) == [(1.0, "t1"), (3.0, "t3")]
+    assert [entry["timestamp"] for entry in reopened.page("Hangman", 1, 3)] == ["t17", "t16", "t15"]
+
+
+def test_score_log_rebuilds_stats_for_a_replaced_log(tmp_path) -> None:
+    """Test a sidecar left from another log of at least the same length is not trusted"""
+    path = str(tmp_path / "scores.jsonl")
+    log = scoreboard.ScoreLog(path, None)
+    log.append("Hangman", 5.0, "Win", "t1")
+    log.append("Hangman", 6.0, "Win", "t2")
+    assert log.stats("Hangman").count == 2
+    # Restored from a backup of the same size with different games, the sidecar stays behind
+    with open(path, "wb") as file:
+        file.write(b"".join(scoreboard._encode(scoreboard.make_entry("Tic Tac Toe", 7.0, "Draw", f"u{n}"))
+                            for n in range(3)))
+    reopened = scoreboard.ScoreLog(path, None)
+    assert reopened.games() == ["Tic Tac Toe"] and reopened.stats("Tic Tac Toe").count == 3
+    assert scoreboard.ScoreLog(path, None).stats("Tic Tac Toe").count == 3, "The rebuilt sidecar should be reused"
+
+
+def test_score_writer_batches_in_background(tmp_path) -> None:
+    """Test queued scores reach the log in one batch on flush and close"""
+    log = scoreboard.ScoreLog(str(tmp_path / "scores.jsonl"), None)
+    writes = []
+    append_many = log.append_many
+    log.append_many = lambda entries: writes.append(len(entries)) or append_many(entries)
+    writer = scoreboard.ScoreWriter(log, interval=60)
+    for seconds in range(5):
+        writer.submit("Hangman", float(seconds), "Loss")
+    writer.flush()
+    writer.submit("Hangman", 9.0, "Win")
+    writer.close()
+    assert writes == [5, 1], "Queued scores should share one write"
+    assert log.stats("Hangman").count == 6
+
+
 # ---------- Tic-Tac-Toe Tests ----------
 def test_tic_tac_toe_winner() -> None:
     """Test win condition detection"""
@@ -53,6 +443,137 @@ def test_tic_tac_toe_winner() -> None:
     assert winner == "X", "Should detect row win"
 
 
+def test_tic_tac_toe_gomoku_board() -> None:
+    """Test k in a row on a large board is found through the last move only"""
+    board = tictactoe.Board(19, 19, 5)
+    for step in range(4):
+        assert board.play(10 + step, 3 + step) is None
+        board.play(0, step)
+    assert board.play(14, 7) == 0, "Fifth diagonal mark should win"
+    with pytest.raises(ValueError):
+        board.play(18, 18)
+    board.undo()
+    assert board.winner is None and board.cell(14, 7) is None
+    assert tictactoe.check_winner([["O", "X", None, None], [None, "O", None, "X"], [None, None, "O", "X"]]) == "O"
+
+
+def test_tic_tac_toe_ai_perfect_play() -> None:
+    """Test the search draws against itself and takes or blocks a win"""
+    search = tictactoe_ai.Search(3, 3, 3)
+    board = tictactoe.Board()
+    while not board.is_over:
+        board.play_index(search.choose(board, budget=5)[0])
+    assert board.winner is None, "Perfect play should end in a draw"
+    board = tictactoe.Board()
+    for row, col in [(0, 0), (1, 1), (0, 1)]:
+        board.play(row, col)
+    assert search.choose(board, budget=5)[0] == 2, "O should block the top row"
+
+    player = tictactoe_ai.ComputerPlayer(budget=5)
+    player.start(board)
+    while player.thinking:
+        time.sleep(0.01)
+    assert player.poll() == 2
+
+
+def test_tic_tac_toe_ai_cancel_is_prompt(monkeypatch) -> None:
+    """Test cancelling a search, even one only just started, does not wait out its budget"""
+    choose = tictactoe_ai.Search.choose
+
+    def late_choose(search, *args, **kwargs):
+        time.sleep(0.05)  # The cancel arrives before the thread reaches choose
+        return choose(search, *args, **kwargs)
+
+    monkeypatch.setattr(tictactoe_ai.Search, "choose", late_choose)
+    player = tictactoe_ai.ComputerPlayer(budget=30)
+    board = tictactoe.Board(15, 15, 5)
+    board.play(7, 7)
+    for _ in range(3):
+        start = time.perf_counter()
+        player.start(board)
+        player.cancel()
+        assert time.perf_counter() - start < 2 and not player.thinking
+
+
+def test_text_cache_reuses_surfaces(monkeypatch) -> None:
+    """Test unchanged text is rendered once and old entries are evicted"""
+    pygame.font.init()
+    text_font = pygame.font.Font(None, 20)
+    monkeypatch.setattr(Project, "TEXT_CACHE_SIZE", 2)
+    Project.text_cache.clear()
+    first = Project.render_text(text_font, "Menu", (0, 0, 0))
+    assert Project.render_text(text_font, "Menu", (0, 0, 0)) is first, "Same text should come from the cache"
+    Project.render_text(text_font, "Menu", (255, 0, 0))
+    Project.render_text(text_font, "Start", (0, 0, 0))
+    assert Project.render_text(text_font, "Menu", (0, 0, 0)) is not first, "Least recently used text is dropped"
+
+
+def test_ticker_decouples_steps_from_frames() -> None:
+    """Test fast rates run several steps per frame and slow rates one step every few frames"""
+    fast = frames.Ticker(600)
+    assert [fast.advance(1 / 60) for _ in range(3)] == [10, 10, 10]
+    slow = frames.Ticker(20)
+    assert sum(slow.advance(1 / 60) for _ in range(60)) == 20
+    assert frames.Ticker(1000, max_steps=50).advance(10) == 50, "A stalled frame must not queue unbounded steps"
+
+
+def test_particle_system_recycles_slots() -> None:
+    """Test dead particles return to the free list and the buffer never grows"""
+    system = particles.ParticleSystem(capacity=100, seed=1)
+    assert system.emit(50, 50, 80, (255, 0, 0)) == 80
+    assert system.emit(50, 50, 80, (0, 255, 0)) == 20, "Only the free slots are filled"
+    system.update(5.0)
+    assert len(system) == 0
+    assert system.emit(50, 50, 100, (0, 0, 255)) == 100
+    assert system.alive.all(), "Every slot was reused"
+    surface = pygame.Surface((100, 100))
+    system.update(0.01)
+    system.draw(surface)
+    assert pygame.transform.average_color(surface)[2] > 0, "Particles are drawn in their color"
+
+
+def test_profiler_scopes_and_export(tmp_path) -> None:
+    """Test the profiler records nothing while off, then per-frame percentiles, rates and a trace"""
+    profiler = profiling.Profiler()
+    with profiler.scope("step"):
+        pass
+    profiler.end_frame()
+    assert profiler.frame == 0 and not profiler.trace, "A disabled profiler must not record"
+    profiler.toggle()
+    for _ in range(10):
+        profiler.begin_frame()
+        with profiler.scope("step"):
+            time.sleep(0.001)
+        profiler.lap("draw")
+        profiler.count("generations", 5)
+        profiler.end_frame()
+    assert profiler.frame == 10
+    assert profiler.percentile("step", 50) >= 0.001
+    assert profiler.percentile("frame", 99) >= profiler.percentile("step", 50)
+    assert 0 < profiler.rate("generations") < 5000
+    profiler.export(tmp_path / "trace.csv")
+    profiler.export(tmp_path / "trace.json")
+    rows = (tmp_path / "trace.csv").read_text().splitlines()
+    assert rows[0] == "frame,scope,start,seconds" and len(rows) == 1 + 30
+    summary = json.loads((tmp_path / "trace.json").read_text())["summary"]
+    assert summary["frames"] == 10 and set(summary["scopes"]) == {"frame", "step", "draw"}
+
+
+def test_benchmark_report_and_compare(tmp_path) -> None:
+    """Test a quick benchmark run is JSON-ready and comparing runs flags slowdowns"""
+    report = benchmarks.run(("life", "scores"), quick=True)
+    json.dumps(report)
+    names = {result["name"] for result in report["results"]}
+    assert {"life_step", "score_append", "load_scores"} <= names
+    assert report["meta"]["seed"] == benchmarks.SEED
+    slower = json.loads(json.dumps(report))
+    for result in slower["results"]:
+        result["best"] *= 2
+    rows, regressions = benchmarks.compare(report, slower)
+    assert len(rows) == len(report["results"]) == len(regressions)
+    assert not benchmarks.compare(report, report)[1]
+
+
 # ---------- Button Test ----------
 def test_button_click() -> None:
     """Test click detection"""
@@ -0,0 +1,229 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Headless: the render benchmarks draw into a hidden window
+
+import numpy as np
+import pygame
+
+import hangman_solver
+import life
+import Project
+import scoreboard
+import words
+
+SEED = 0
+# Engines too slow for large boards are only measured up to this size
+MAX_SIZE = {"list": 256, "sparse": 256}
+
+FULL = {
+    "life_sizes": (64, 256, 1024), "life_densities": (0.1, 0.3, 0.5),
+    "life_engines": ("list", "numpy", "sparse", "bitpacked"),
+    "generations": 10, "grids": ((20, 20), (100, 5), (400, 1)), "frames": 100,
+    "histories": (100, 1000, 10000, 100000), "word_counts": (10000, 100000, 400000), "choices": 10000, "repeat": 5,
+}
+QUICK = {
+    "life_sizes": (64,), "life_densities": (0.3,), "life_engines": ("numpy", "bitpacked"),
+    "generations": 2, "grids": ((20, 20),), "frames": 5,
+    "histories": (100,), "word_counts": (1000,), "choices": 100, "repeat": 2,
+}
+
+
+def _time(function, repeat=5, number=1):
+    # Best and median seconds per call over repeat runs of number calls
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        runs.append((time.perf_counter() - start) / number)
+    return {"best": min(runs), "median": float(np.median(runs))}
+
+
+def _result(name, params, timing, **extra):
+    return {"name": name, "params": params, **timing, **extra}
+
+
+def bench_life(sizes, densities, engines, generations, repeat, seed=SEED):
+    # Seconds per generation on random soups, the same soup for every engine
+    results = []
+    for size in sizes:
+        for density in densities:
+            grid = np.random.default_rng(seed).random((size, size)) < density
+            for name in engines:
+                if size > MAX_SIZE.get(name, size):
+                    continue
+                engine = life.make_engine(name, size, size, True, grid)
+                engine.step()  # Warm-up: buffers and caches
+                timing = _time(lambda: engine.step(generations), repeat)
+                timing = {key: seconds / generations for key, seconds in timing.items()}
+                results.append(_result("life_step", {"engine": name, "size": size, "density": density}, timing,
+                                       cells_per_second=size * size / timing["best"]))
+    return results
+
+
+def bench_render(grids, frames, repeat, seed=SEED):
+    # Frame times of the menu background and of the Game of Life board, full redraws and frame-to-frame updates
+    Project.init_display()
+    results = []
+    shifts = itertools.count(0, 0.002)
+    timing = _time(lambda: Project.draw_animated_gradient(Project.LIGHT_BLUE, Project.BLUE, next(shifts)),
+                   repeat, frames)
+    results.append(_result("menu_gradient", {}, timing))
+
+    def menu_frame():
+        Project.draw_animated_gradient(Project.LIGHT_BLUE, Project.BLUE, next(shifts))
+        for button in Project.buttons:
+            button.draw(Project.screen)
+        pygame.display.flip()
+
+    results.append(_result("menu_frame", {}, _time(menu_frame, repeat, frames)))
+
+    for size, cell_size in grids:
+        engine = life.make_engine("numpy", size, size, True,
+                                  np.random.default_rng(seed).random((size, size)) < 0.3)
+        generations = []
+        for _ in range(frames):
+            engine.step()
+            generations.append(engine.cells.copy())
+        renderer = Project.GridRenderer(size, size, cell_size, (50, 50))
+        cells = itertools.cycle(generations)
+
+        def full_redraw():
+            renderer.invalidate()
+            renderer.draw(Project.screen, next(cells))
+
+        params = {"size": size, "cell_size": cell_size}
+        results.append(_result("draw_grid_full", params, _time(full_redraw, repeat, frames)))
+        renderer.draw(Project.screen, generations[-1])  # The cycle continues from the first generation
+        results.append(_result("draw_grid_step", params,
+                               _time(lambda: renderer.draw(Project.screen, next(cells)), repeat, frames)))
+    pygame.quit()
+    return results
+
+
+def bench_scores(histories, repeat, seed=SEED):
+    # save_score and load_scores paths against a log that already holds n games
+    rng = random.Random(seed)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for count in histories:
+            path = os.path.join(directory, f"scores-{count}.jsonl")
+            log = scoreboard.ScoreLog(path, os.path.join(directory, "missing.json"))
+            log.append_many([scoreboard.make_entry(rng.choice(list(Project.games)), rng.uniform(5, 300),
+                                                   rng.choice(["Win", "Loss", "X Wins", "Draw"]),
+                                                   "2024-01-01 00:00:00") for _ in range(count)])
+            params = {"history": count}
+            results.append(_result("score_append", params,
+                                   _time(lambda: log.append("Hangman", 42.0, "Win"), repeat)))
+            writer = scoreboard.ScoreWriter(log)
+            results.append(_result("score_submit", params,
+                                   _time(lambda: writer.submit("Hangman", 42.0, "Win"), repeat, 100)))
+            writer.close()
+            results.append(_result("load_scores", params, _time(log.all, repeat)))
+            results.append(_result("score_page", params, _time(lambda: log.page("Hangman", 0, 10), repeat)))
+            results.append(_result("score_open", params,
+                                   _time(lambda: scoreboard.ScoreLog(path).stats("Hangman"), repeat)))
+    return results
+
+
+def bench_words(word_counts, choices, repeat, path=words.WORDS_FILE, seed=SEED):
+    # Building and opening word indexes, and drawing words from them
+    results = []
+    sources = [(count, hangman_solver.synthetic_words(count, seed)) for count in word_counts]
+    if os.path.exists(path):
+        sources.append((path, words.read_words(path)))
+    with tempfile.TemporaryDirectory() as directory:
+        for source, word_list in sources:
+            params = {"words": source if isinstance(source, int) else os.path.basename(source)}
+            index_path = os.path.join(directory, f"{len(word_list)}.idx")
+            results.append(_result("word_index_build", params,
+                                   _time(lambda: words.WordIndex.from_words(word_list).save(index_path), repeat)))
+            results.append(_result("word_index_open", params, _time(lambda: words.open_index(index_path), repeat)))
+            index = words.open_index(index_path)
+            rng = random.Random(seed)
+            results.append(_result("word_choice", params, _time(lambda: index.choice(rng=rng), repeat, choices)))
+            length = max(set(len(word) for word in index), key=lambda n: index.count(n, words.HARD))
+            results.append(_result("word_choice", {**params, "length": length, "difficulty": words.HARD},
+                                   _time(lambda: index.choice(length, words.HARD, rng), repeat, choices)))
+            del index
+    return results
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(suites=("life", "render", "scores", "words"), quick=False, seed=SEED):
+    config = QUICK if quick else FULL
+    repeat = config["repeat"]
+    results = []
+    if "life" in suites:
+        results += bench_life(config["life_sizes"], config["life_densities"], config["life_engines"],
+                              config["generations"], repeat, seed)
+    if "render" in suites:
+        results += bench_render(config["grids"], config["frames"], repeat, seed)
+    if "scores" in suites:
+        results += bench_scores(config["histories"], repeat, seed)
+    if "words" in suites:
+        results += bench_words(config["word_counts"], config["choices"], repeat, seed=seed)
+    meta = {"commit": _commit(), "time": time.strftime("%Y-%m-%d %H:%M:%S"), "seed": seed, "quick": quick,
+            "python": platform.python_version(), "numpy": np.__version__, "pygame": pygame.version.ver,
+            "platform": platform.platform(), "cpus": os.cpu_count()}
+    return {"meta": meta, "results": results}
+
+
+def _key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(old, new, threshold=0.1):
+    # (name, params, old best, new best, ratio) for the benchmarks in both runs; ratio > 1 is slower
+    previous = {_key(result): result["best"] for result in old["results"]}
+    rows = []
+    for result in new["results"]:
+        before = previous.get(_key(result))
+        if before:
+            rows.append((result["name"], result["params"], before, result["best"], result["best"] / before))
+    regressions = [row for row in rows if row[4] > 1 + threshold]
+    return rows, regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks of the simulation, rendering and storage hot paths")
+    parser.add_argument("--output", default="benchmarks.json", help="JSON file for the results")
+    parser.add_argument("--suite", action="append", choices=("life", "render", "scores", "words"),
+                        help="Run only this suite, can be repeated")
+    parser.add_argument("--quick", action="store_true", help="Small inputs, for a smoke run")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--compare", metavar="OLD", help="Results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown reported as a regression")
+    args = parser.parse_args()
+    report = run(args.suite or ("life", "render", "scores", "words"), args.quick, args.seed)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=1)
+    for result in report["results"]:
+        print(f"{result['name']:18} {json.dumps(result['params']):55} {result['best'] * 1000:10.3f} ms")
+    if args.compare:
+        with open(args.compare) as file:
+            old = json.load(file)
+        rows, regressions = compare(old, report, args.threshold)
+        print(f"\nAgainst {args.compare} ({old['meta'].get('commit')}):")
+        for name, params, before, after, ratio in rows:
+            flag = "  slower" if ratio > 1 + args.threshold else ""
+            print(f"{name:18} {json.dumps(params):55} {before * 1000:10.3f} -> {after * 1000:10.3f} ms"
+                  f" ({ratio - 1:+.0%}){flag}")
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,207 @@
+import glob
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+import numpy as np
+
+import life
+import rules
+
+# Header: magic, version, flags, board rows/cols, generation, stored box (top, left, height, width),
+# CRC32 and length of the zlib-compressed bit-packed cells, length of the ASCII rulestring.
+# The rulestring follows the header, then the cells.
+MAGIC = b"LIFECKPT"
+VERSION = 2
+HEADER = struct.Struct("<8sHHQQQqqQQIQH")
+HEADER_V1 = struct.Struct("<8sHHQQQqqQQIQ")  # Version 1 had no rule, it always ran B3/S23
+FLAG_WRAP = 1
+FLAG_UNBOUNDED = 2
+NAME_FORMAT = "life-{:012d}.ckpt"
+
+
+class Snapshot:
+    # Bit-packed copy of a board, cheap enough to take on the stepping thread
+    __slots__ = ("rows", "cols", "generation", "flags", "box", "bits", "rule")
+
+    def __init__(self, rows, cols, generation, flags, box, bits, rule=rules.CONWAY):
+        self.rows = rows
+        self.cols = cols
+        self.generation = generation
+        self.flags = flags
+        self.box = box  # (top, left, height, width) of the stored cells
+        self.bits = bits  # height x ceil(width / 8) uint8, little-endian bit order
+        self.rule = rule  # Rulestring the board was running
+
+
+def take_snapshot(engine):
+    flags = (FLAG_WRAP if engine.wrap else 0) | (FLAG_UNBOUNDED if engine.unbounded else 0)
+    if engine.unbounded:
+        cells = np.array(list(engine.live_cells()), dtype=np.int64).reshape(-1, 2)
+        if len(cells):
+            top, left = cells.min(axis=0)
+            height, width = cells.max(axis=0) - (top, left) + 1
+        else:
+            top = left = height = width = 0
+        board = np.zeros((height, width), dtype=bool)
+        board[cells[:, 0] - top, cells[:, 1] - left] = True
+        bits = np.packbits(board, axis=1, bitorder="little")
+        box = (int(top), int(left), int(height), int(width))
+    elif hasattr(engine, "words"):
+        # Bit-packed engines already store the little-endian bit layout
+        bits = engine.words.view(np.uint8)[:, :(engine.cols + 7) // 8].copy()
+        box = (0, 0, engine.rows, engine.cols)
+    else:
+        bits = np.packbits(engine.to_array(), axis=1, bitorder="little")
+        box = (0, 0, engine.rows, engine.cols)
+    return Snapshot(engine.rows, engine.cols, engine.generation, flags, box, bits, engine.rule.rulestring)
+
+
+def write_snapshot(snapshot, path, level=6):
+    payload = zlib.compress(snapshot.bits.tobytes(), level)
+    rule = snapshot.rule.encode("ascii")
+    header = HEADER.pack(MAGIC, VERSION, snapshot.flags, snapshot.rows, snapshot.cols, snapshot.generation,
+                         *snapshot.box, zlib.crc32(payload), len(payload), len(rule)) + rule
+    # Write to a temporary file and rename it, so a crash never leaves a half-written checkpoint
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(header)
+        file.write(payload)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def read_snapshot(path):
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if len(data) < HEADER_V1.size:
+            raise ValueError(f"{path} is too short to be a checkpoint")
+        magic, version = struct.unpack_from("<8sH", data)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError(f"{path} is not a version 1 or {VERSION} checkpoint")
+        if version == 1:
+            fields = HEADER_V1.unpack_from(data)
+            start, rule = HEADER_V1.size, rules.CONWAY
+        else:
+            if len(data) < HEADER.size:
+                raise ValueError(f"{path} is too short to be a checkpoint")
+            *fields, rule_length = HEADER.unpack_from(data)
+            start = HEADER.size + rule_length
+            rule = data[HEADER.size:start].decode("ascii")
+        _, _, flags, rows, cols, generation, top, left, height, width, crc, length = fields
+        with memoryview(data)[start:start + length] as payload:
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                raise ValueError(f"{path} is truncated or corrupted")
+            raw = zlib.decompress(payload)
+    bits = np.frombuffer(raw, dtype=np.uint8).reshape(height, (width + 7) // 8)
+    return Snapshot(rows, cols, generation, flags, (top, left, height, width), bits, rule)
+
+
+def restore(snapshot, engine="numpy", **options):
+    # Builds an engine from a snapshot, or loads the snapshot into an existing engine.
+    # The board keeps the rule it was saved with, a different rule is refused.
+    stored = rules.parse_rule(snapshot.rule)
+    requested = rules.parse_rule(options.get("rule", stored) if isinstance(engine, str) else engine.rule)
+    if requested != stored:
+        raise ValueError(f"The checkpoint runs {stored}, not {requested}")
+    if isinstance(engine, str):
+        if snapshot.flags & FLAG_UNBOUNDED and engine == "sparse":
+            options.setdefault("unbounded", True)
+        options["rule"] = stored
+        engine = life.make_engine(engine, snapshot.rows, snapshot.cols,
+                                  bool(snapshot.flags & FLAG_WRAP), **options)
+    top, left, height, width = snapshot.box
+    cells = np.unpackbits(snapshot.bits, axis=1, count=width, bitorder="little")
+    if snapshot.box == (0, 0, engine.rows, engine.cols) and not engine.unbounded:
+        engine.load(cells)
+    elif height:
+        edges = np.diff(cells.astype(np.int8), axis=1, prepend=0, append=0)
+        rows, starts = np.nonzero(edges == 1)
+        stops = np.nonzero(edges == -1)[1]
+        engine.set_runs(rows + top, starts + left, stops - starts)
+    engine.generation = snapshot.generation
+    return engine
+
+
+def checkpoint_paths(directory):
+    # Newest first
+    return sorted(glob.glob(os.path.join(directory, "life-*.ckpt")), reverse=True)
+
+
+def resume(directory, engine="numpy", **options):
+    # Engine restored from the newest readable checkpoint, None if there is none
+    for path in checkpoint_paths(directory):
+        try:
+            snapshot = read_snapshot(path)
+        except (OSError, ValueError) as e:
+            print(f"Skipping checkpoint {path}: {e}")
+            continue
+        return restore(snapshot, engine, **options)
+    return None
+
+
+# Saves checkpoints every `every` generations on a background thread
+class Checkpointer:
+    def __init__(self, directory, every=1000, keep=3, level=6):
+        self.directory = directory
+        self.every = every
+        self.keep = keep
+        self.level = level
+        self.last_generation = None
+        self.written = 0
+        os.makedirs(directory, exist_ok=True)
+        self._pending = None  # Only the newest snapshot waits, older unwritten ones are dropped
+        self._writing = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def due(self, engine):
+        return self.last_generation is None or engine.generation - self.last_generation >= self.every
+
+    def maybe_save(self, engine):
+        if self.due(engine):
+            self.save(engine)
+
+    def save(self, engine):
+        snapshot = take_snapshot(engine)
+        self.last_generation = engine.generation
+        with self._condition:
+            self._pending = snapshot
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                snapshot, self._pending = self._pending, None
+                if snapshot is None:
+                    return
+                self._writing = True
+            path = os.path.join(self.directory, NAME_FORMAT.format(snapshot.generation))
+            try:
+                write_snapshot(snapshot, path, self.level)
+                self.written += 1
+                for old in checkpoint_paths(self.directory)[self.keep:]:
+                    os.remove(old)
+            except OSError as e:
+                print(f"Error writing checkpoint {path}: {e}")
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def flush(self):
+        # Blocks until the pending snapshot is on disk
+        with self._condition:
+            while self._pending is not None or self._writing:
+                self._condition.wait()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
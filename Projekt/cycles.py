@@ -0,0 +1,73 @@
+from collections import deque, namedtuple
+
+import numpy as np
+
+# kind is "extinct", "still" or "oscillator"; the board at generation start + period equals the one at start
+Cycle = namedtuple("Cycle", ["kind", "start", "period"])
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+_SHIFT32 = np.uint64(32)
+
+
+def cell_keys(rows, cols, seed=0):
+    # Zobrist key of every (row, col), computed with splitmix64 instead of a table so any board size works
+    with np.errstate(over="ignore"):
+        x = (np.asarray(rows, dtype=np.int64).astype(np.uint64) << _SHIFT32)
+        x ^= np.asarray(cols, dtype=np.int64).astype(np.uint64) & _MASK32
+        x += np.uint64((0x9E3779B97F4A7C15 * (seed + 1)) & 0xFFFFFFFFFFFFFFFF)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def board_hash(rows, cols, seed=0):
+    return int(np.bitwise_xor.reduce(cell_keys(rows, cols, seed))) if len(rows) else 0
+
+
+# Detects extinction, still lifes and cycles from a hash of the board updated with the flipped cells only
+class CycleDetector:
+    def __init__(self, history=4096, seed=0):
+        self.history = history  # Generations remembered, so the longest period that can be found
+        self.seed = seed
+        self.hash = 0
+        self.cycle = None
+        self._seen = {}  # board hash -> first generation it was seen
+        self._order = deque()
+
+    def reset(self, engine):
+        # Full hash of the current board; call it again after editing cells by hand
+        cells = np.array(list(engine.live_cells()), dtype=np.int64).reshape(-1, 2)
+        self.hash = board_hash(cells[:, 0], cells[:, 1], self.seed)
+        self.cycle = None
+        self._seen.clear()
+        self._order.clear()
+        self._remember(self.hash, engine.generation)
+
+    def _remember(self, key, generation):
+        self._seen[key] = generation
+        self._order.append(key)
+        if len(self._order) > self.history:
+            del self._seen[self._order.popleft()]
+
+    def observe(self, engine):
+        # Call after every single-generation step; returns the Cycle once one is found
+        if self.cycle is not None:
+            return self.cycle
+        changed = engine.changed_cells()
+        if changed is not None:
+            self.hash ^= board_hash(*changed, self.seed)
+        else:
+            cells = np.array(list(engine.live_cells()), dtype=np.int64).reshape(-1, 2)
+            self.hash = board_hash(cells[:, 0], cells[:, 1], self.seed)
+
+        generation = engine.generation
+        if engine.population == 0:
+            first = self._seen.get(self.hash, generation)
+            self.cycle = Cycle("extinct", first, 1)
+        elif self.hash in self._seen:
+            start = self._seen[self.hash]
+            period = generation - start
+            self.cycle = Cycle("still" if period == 1 else "oscillator", start, period)
+        else:
+            self._remember(self.hash, generation)
+        return self.cycle
@@ -0,0 +1,56 @@
+import pygame
+
+FPS = 60
+
+
+# Frame pacing for the game loops: capped frame rate while animating, blocking on input when idle
+class FrameClock:
+    def __init__(self, fps=FPS, profiler=None):
+        self.fps = fps
+        self.profiler = profiler  # Frames are measured from tick to tick, F3 turns it on and off
+        self.dt = 0.0  # Seconds since the previous frame, 0 after an idle wait
+        self._clock = pygame.time.Clock()
+        self._redraw = True
+
+    def wake(self):
+        # Something changed outside the event queue, draw one more frame before idling
+        self._redraw = True
+
+    def tick(self, animating=True):
+        # Returns the events of this frame, replacing pygame.event.get in the loops
+        if self.profiler:
+            self.profiler.end_frame()
+        if animating or self._redraw:
+            self.dt = self._clock.tick(self.fps) / 1000
+            events = pygame.event.get()
+        else:
+            events = [pygame.event.wait()] + pygame.event.get()
+            self._clock.tick()
+            self.dt = 0.0
+        # The loops draw before handling events, so the frame after any input must still be drawn
+        self._redraw = bool(events)
+        if self.profiler:
+            self.profiler.begin_frame()
+            toggles = [event for event in events if event.type == pygame.KEYDOWN and event.key == pygame.K_F3]
+            for event in toggles:
+                self.profiler.toggle()
+                events.remove(event)
+        return events
+
+
+# Fixed-rate simulation steps decoupled from the frame rate
+class Ticker:
+    def __init__(self, rate, max_steps=1000):
+        self.rate = rate  # Steps per second
+        self.max_steps = max_steps  # A slow frame never queues more than this
+        self._due = 0.0
+
+    def advance(self, dt):
+        # Steps to run this frame: several per frame above the frame rate, one every few frames below it
+        self._due = min(self._due + dt * self.rate, self.max_steps)
+        steps = int(self._due)
+        self._due -= steps
+        return steps
+
+    def reset(self):
+        self._due = 0.0
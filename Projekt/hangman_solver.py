@@ -0,0 +1,206 @@
+import argparse
+import random
+import time
+from collections import Counter
+
+import numpy as np
+
+import words
+
+MAX_MISSES = 6
+
+
+def letter_mask(word, letter):
+    # Bit p set where word[p] is letter
+    mask = 0
+    for position, char in enumerate(word):
+        if char == letter:
+            mask |= 1 << position
+    return mask
+
+
+def _bitset(flags):
+    # Bool array -> int with bit i set for every true flags[i]
+    return int.from_bytes(np.packbits(flags, bitorder="little").tobytes(), "little")
+
+
+# Words of one length as bitsets: patterns[c][mask] has bit i set when word i has letter c exactly
+# at the positions in mask, so one AND applies the answer to a guess
+class _LengthGroup:
+    def __init__(self, group_words, alphabet):
+        self.words = group_words
+        self.length = len(group_words[0])
+        self.all = (1 << len(group_words)) - 1
+        chars = np.array(group_words, dtype=f"<U{self.length}").view(np.uint32).reshape(len(group_words), -1)
+        weights = 1 << np.arange(self.length, dtype=np.int64)
+        self.patterns = []
+        self.contains = []
+        for letter in alphabet:
+            masks = (chars == ord(letter)) @ weights
+            self.patterns.append({int(mask): _bitset(masks == mask) for mask in np.unique(masks)})
+            self.contains.append(self.all & ~self.patterns[-1].get(0, 0))
+        self.root = None
+
+    def narrow(self, candidates, letter, mask):
+        # Keep the words that have letter exactly at the positions in mask
+        return candidates & self.patterns[letter].get(mask, 0)
+
+
+# Node of the bot's decision tree, shared by every game with the same answers so far
+class _Node:
+    __slots__ = ("candidates", "guessed", "letter", "children")
+
+    def __init__(self, candidates, guessed):
+        self.candidates = candidates
+        self.guessed = guessed  # Bit per alphabet letter already tried
+        self.letter = -1  # Not chosen yet
+        self.children = {}
+
+
+# Candidate words narrowed guess by guess during one game
+class HangmanState:
+    def __init__(self, solver, length):
+        self.solver = solver
+        self.group = solver._group(length)
+        self.candidates = self.group.all if self.group else 0
+        self.guessed = 0
+
+    def guess(self, letter, mask):
+        # mask: positions where the letter turned out to be, 0 for a miss
+        index = self.solver.letters.get(letter)
+        if index is None or self.guessed >> index & 1:
+            return
+        self.guessed |= 1 << index
+        if self.group:
+            self.candidates = self.group.narrow(self.candidates, index, mask)
+
+    @property
+    def count(self):
+        return self.candidates.bit_count()
+
+    def words(self):
+        candidates = self.candidates
+        while candidates:
+            low = candidates & -candidates
+            yield self.group.words[low.bit_length() - 1]
+            candidates ^= low
+
+    def best_letter(self):
+        index = self.solver._best(self.group, self.candidates, self.guessed)
+        return None if index is None else self.solver.alphabet[index]
+
+
+# Picks the untried letter found in the most remaining candidate words
+class HangmanSolver:
+    def __init__(self, word_list, max_misses=MAX_MISSES):
+        self.max_misses = max_misses
+        word_list = sorted({word.strip().upper() for word in word_list if word.strip()})
+        frequency = Counter()
+        for word in word_list:
+            frequency.update(set(word))
+        # Most common letters first, so ties and empty candidate sets fall back to them
+        self.alphabet = sorted(frequency, key=lambda letter: (-frequency[letter], letter))
+        self.letters = {letter: index for index, letter in enumerate(self.alphabet)}
+        self._words = {}
+        for word in word_list:
+            self._words.setdefault(len(word), []).append(word)
+        self._groups = {}
+
+    def _group(self, length):
+        # Bitsets are built the first time a length is played
+        if length not in self._groups:
+            group_words = self._words.get(length)
+            self._groups[length] = _LengthGroup(group_words, self.alphabet) if group_words else None
+        return self._groups[length]
+
+    def _best(self, group, candidates, guessed):
+        best, best_count = None, -1
+        for index in range(len(self.alphabet)):
+            if guessed >> index & 1:
+                continue
+            count = (candidates & group.contains[index]).bit_count() if group and candidates else 0
+            if count > best_count:
+                best, best_count = index, count
+        return best
+
+    def start(self, length):
+        return HangmanState(self, length)
+
+    def hint(self, display_word, guessed_letters):
+        # Best next letter for a get_display_word pattern such as "P Y _ _ _ _"
+        pattern = display_word.split()
+        state = self.start(len(pattern))
+        for letter in guessed_letters:
+            mask = sum(1 << position for position, shown in enumerate(pattern) if shown == letter)
+            state.guess(letter, mask)
+        return state.best_letter()
+
+    def play(self, word):
+        # Bot game on a known word; returns the number of wrong guesses
+        word = word.upper()
+        group = self._group(len(word))
+        if group is None:
+            return self.max_misses
+        if group.root is None:
+            group.root = _Node(group.all, 0)
+        node = group.root
+        full = (1 << len(word)) - 1
+        revealed = misses = 0
+        while revealed != full and misses < self.max_misses:
+            if node.letter == -1:
+                node.letter = self._best(group, node.candidates, node.guessed)
+            if node.letter is None:
+                break
+            mask = letter_mask(word, self.alphabet[node.letter])
+            child = node.children.get(mask)
+            if child is None:
+                child = _Node(group.narrow(node.candidates, node.letter, mask), node.guessed | 1 << node.letter)
+                node.children[mask] = child
+            if mask:
+                revealed |= mask
+            else:
+                misses += 1
+            node = child
+        return misses
+
+
+def synthetic_words(count, seed=0):
+    # Random words with English letter frequencies, for benchmarks on dictionary-sized inputs
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("ETAOINSHRDLCUMWFGYPBVKJXQZ"))
+    weights = 1.0 / np.arange(1, 27)
+    weights /= weights.sum()
+    lengths = rng.integers(4, 13, count)
+    chars = letters[rng.choice(26, lengths.sum(), p=weights)]
+    ends = np.cumsum(lengths)
+    return ["".join(chars[end - length:end]) for end, length in zip(ends.tolist(), lengths.tolist())]
+
+
+def benchmark(word_list, games=10000, seed=0):
+    # Full bot games on random words from word_list, including building the bitsets they need
+    start = time.perf_counter()
+    solver = HangmanSolver(word_list)
+    setup = time.perf_counter() - start
+    rng = random.Random(seed)
+    targets = [rng.choice(word_list) for _ in range(games)]
+    start = time.perf_counter()
+    misses = [solver.play(word) for word in targets]
+    seconds = time.perf_counter() - start
+    return {"words": len(word_list), "games": games, "setup_seconds": setup, "seconds": seconds,
+            "games_per_second": games / seconds if seconds else float("inf"),
+            "win_rate": sum(miss < solver.max_misses for miss in misses) / games}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hangman bot benchmark")
+    parser.add_argument("--words", default=words.WORDS_FILE, help="Word list to play on")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="N",
+                        help="Play on N generated words instead of --words")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    word_list = synthetic_words(args.synthetic, args.seed) if args.synthetic else list(words.load_index(args.words))
+    result = benchmark(word_list, args.games, args.seed)
+    print(f"{result['words']} words, {result['games']} games in {result['seconds']:.3f}s "
+          f"({result['games_per_second']:.0f} games/s, setup {result['setup_seconds']:.3f}s), "
+          f"bot wins {result['win_rate']:.0%}")
@@ -0,0 +1,338 @@
+import numpy as np
+
+from life import ENGINES, LifeEngine, expand_runs
+
+
+# Quadtree node: level k covers a 2**k x 2**k square, level 0 is a single cell
+class Node:
+    __slots__ = ("k", "nw", "ne", "sw", "se", "population")
+
+    def __init__(self, k, nw, ne, sw, se, population):
+        self.k = k
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+
+OFF = Node(0, None, None, None, None, 0)
+ON = Node(0, None, None, None, None, 1)
+
+
+# HashLife engine: memoized quadtree on an unbounded universe, steps any number of generations at once
+class HashLifeEngine(LifeEngine):
+    name = "hashlife"
+    unbounded = True
+
+    def __init__(self, rows, cols, wrap=False, max_nodes=2_000_000, rule=None):
+        if wrap:
+            raise ValueError("HashLife runs on an unbounded universe, use wrap=False")
+        super().__init__(rows, cols, wrap, rule)
+        if 0 in self.rule.birth:
+            raise ValueError("HashLife needs empty space to stay empty, B0 rules are not supported")
+        self.max_nodes = max_nodes
+        self._nodes = {}    # (nw, ne, sw, se) -> canonical node
+        self._results = {}  # (node, j) -> centre of node after 2**j generations
+        self._zeros = [OFF]
+        self._jumping = None  # Enlarged root of the jump in progress
+        # Cache size that triggers a collection, raised when the live nodes alone come close to max_nodes
+        self._limit = max_nodes
+        # The root covers [origin, origin + 2**k) on both axes
+        k = 3
+        while (1 << k) < max(rows, cols):
+            k += 1
+        self.root = self._zero(k)
+        self.origin = (0, 0)
+
+    # ---------- Node cache ----------
+    def _join(self, nw, ne, sw, se):
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(nw.k + 1, nw, ne, sw, se,
+                        nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+        return node
+
+    def _zero(self, k):
+        while len(self._zeros) <= k:
+            z = self._zeros[-1]
+            self._zeros.append(self._join(z, z, z, z))
+        return self._zeros[k]
+
+    def _collect(self):
+        # Evict what is not reachable from the root, the jump in progress or the newest results once the cache
+        # is over its budget. Nodes the running recursion still holds stay valid, they are only no longer shared.
+        nodes = {}
+
+        def mark(*roots):
+            stack = list(roots)
+            while stack:
+                node = stack.pop()
+                if node.k == 0:
+                    continue
+                key = (node.nw, node.ne, node.sw, node.se)
+                if key not in nodes:
+                    nodes[key] = node
+                    stack.extend(key)
+
+        roots = [self.root, *self._zeros[1:]]
+        if self._jumping is not None:
+            roots.append(self._jumping)
+        mark(*roots)
+        live = len(nodes)
+        # The newest results belong to the squares next to the ones being computed, keep them while they fit
+        # in half the budget
+        kept = []
+        for key in reversed(self._results):
+            if len(nodes) > self.max_nodes // 2 or len(kept) >= self.max_nodes // 2:
+                break
+            result = self._results[key]
+            mark(key[0], result)
+            kept.append((key, result))
+        self._nodes = nodes
+        self._results = dict(reversed(kept))
+        # Leave room to work when the board itself needs most of the budget, or every new node would collect
+        self._limit = max(self.max_nodes, 2 * live)
+
+    @property
+    def cache_size(self):
+        return len(self._nodes)
+
+    # ---------- Evolution ----------
+    def _centre(self, m):
+        # Same pattern one level up, centred in an empty border
+        z = self._zero(m.k - 1)
+        return self._join(self._join(z, z, z, m.nw), self._join(z, z, m.ne, z),
+                          self._join(z, m.sw, z, z), self._join(m.se, z, z, z))
+
+    def _inner(self, m):
+        # Central 2**(k-1) square of a node
+        return self._join(m.nw.se, m.ne.sw, m.sw.ne, m.se.nw)
+
+    def _rule(self, centre, *neighbours):
+        count = sum(n.population for n in neighbours)
+        return ON if self.rule.lookup[centre.population][count] else OFF
+
+    def _life_4x4(self, m):
+        # Next generation of the central 2x2 of a level 2 node
+        a, b, c, d = m.nw, m.ne, m.sw, m.se
+        nw = self._rule(a.se, a.nw, a.ne, b.nw, a.sw, b.sw, c.nw, c.ne, d.nw)
+        ne = self._rule(b.sw, a.ne, b.nw, b.ne, a.se, b.se, c.ne, d.nw, d.ne)
+        sw = self._rule(c.ne, a.sw, a.se, b.sw, c.nw, d.nw, c.sw, c.se, d.sw)
+        se = self._rule(d.nw, a.se, b.sw, b.se, c.ne, d.ne, c.se, d.sw, d.se)
+        return self._join(nw, ne, sw, se)
+
+    def _successor(self, m, j):
+        # Centre of m after 2**j generations (at most 2**(k-2))
+        if m.population == 0:
+            return m.nw
+        j = min(j, m.k - 2)
+        key = (m, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+        if m.k == 2:
+            result = self._life_4x4(m)
+        else:
+            join = self._join
+            a, b, c, d = m.nw, m.ne, m.sw, m.se
+            # Nine overlapping sub-squares of half the size
+            c1 = self._successor(a, j)
+            c2 = self._successor(join(a.ne, b.nw, a.se, b.sw), j)
+            c3 = self._successor(b, j)
+            c4 = self._successor(join(a.sw, a.se, c.nw, c.ne), j)
+            c5 = self._successor(join(a.se, b.sw, c.ne, d.nw), j)
+            c6 = self._successor(join(b.sw, b.se, d.nw, d.ne), j)
+            c7 = self._successor(c, j)
+            c8 = self._successor(join(c.ne, d.nw, c.se, d.sw), j)
+            c9 = self._successor(d, j)
+            if j < m.k - 2:
+                result = join(join(c1.se, c2.sw, c4.ne, c5.nw), join(c2.se, c3.sw, c5.ne, c6.nw),
+                              join(c4.se, c5.sw, c7.ne, c8.nw), join(c5.se, c6.sw, c8.ne, c9.nw))
+            else:
+                result = join(self._successor(join(c1, c2, c4, c5), j),
+                              self._successor(join(c2, c3, c5, c6), j),
+                              self._successor(join(c4, c5, c7, c8), j),
+                              self._successor(join(c5, c6, c8, c9), j))
+        self._results[key] = result
+        if len(self._nodes) > self._limit or len(self._results) > self._limit:
+            self._collect()
+        return result
+
+    def _fits(self, m):
+        # All live cells inside the central quarter, so 2**(k-3) generations cannot leave the result
+        return m.k >= 3 and self._inner(self._inner(m)).population == m.population
+
+    def _jump(self, j):
+        root = self.root
+        row, col = self.origin
+        while root.k < j + 3 or not self._fits(root):
+            half = 1 << (root.k - 1)
+            root = self._centre(root)
+            row, col = row - half, col - half
+        quarter = 1 << (root.k - 2)
+        self._jumping = root
+        try:
+            self.root = self._successor(root, j)
+        finally:
+            self._jumping = None
+        self.origin = (row + quarter, col + quarter)
+
+    def step(self, generations=1):
+        # Jump straight to generation + generations, one power of two at a time
+        j = 0
+        remaining = generations
+        while remaining:
+            if remaining & 1:
+                self._jump(j)
+            remaining >>= 1
+            j += 1
+        self.generation += generations
+
+    # ---------- Cell access ----------
+    def get_cell(self, row, col):
+        node = self.root
+        row -= self.origin[0]
+        col -= self.origin[1]
+        size = 1 << node.k
+        if not (0 <= row < size and 0 <= col < size):
+            return 0
+        while node.k > 0:
+            if node.population == 0:
+                return 0
+            half = 1 << (node.k - 1)
+            if row < half:
+                node = node.nw if col < half else node.ne
+            else:
+                node = node.sw if col < half else node.se
+            row %= half
+            col %= half
+        return node.population
+
+    def _set(self, node, row, col, value):
+        if node.k == 0:
+            return ON if value else OFF
+        half = 1 << (node.k - 1)
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        if row < half:
+            if col < half:
+                nw = self._set(nw, row, col, value)
+            else:
+                ne = self._set(ne, row, col - half, value)
+        elif col < half:
+            sw = self._set(sw, row - half, col, value)
+        else:
+            se = self._set(se, row - half, col - half, value)
+        return self._join(nw, ne, sw, se)
+
+    def _cover(self, top, left, bottom, right):
+        # Grow the root until it holds rows top..bottom and columns left..right
+        while True:
+            size = 1 << self.root.k
+            row, col = self.origin
+            if row <= top and bottom < row + size and col <= left and right < col + size:
+                return
+            half = 1 << (self.root.k - 1)
+            self.root = self._centre(self.root)
+            self.origin = (row - half, col - half)
+
+    def set_cell(self, row, col, value):
+        self._cover(row, col, row, col)
+        self.root = self._set(self.root, row - self.origin[0], col - self.origin[1], value)
+
+    def set_run(self, row, col, length):
+        self.set_runs(np.array([row]), np.array([col]), np.array([length]))
+
+    def set_runs(self, rows, cols, lengths):
+        # A whole batch at once: the squares it touches are rebuilt bottom-up instead of one path per cell
+        rows, cols = expand_runs(rows, cols, lengths)
+        if not len(rows):
+            return
+        self._cover(int(rows.min()), int(cols.min()), int(rows.max()), int(cols.max()))
+        self.root = self._add(self.root, rows - self.origin[0], cols - self.origin[1])
+
+    def _add(self, node, rows, cols):
+        # node with the cells at (rows, cols), relative to its corner, turned on
+        if not len(rows):
+            return node
+        k = node.k
+        # Small squares, and squares the cells fill densely enough, are built from an array
+        if k <= 6 or 1 << 2 * k <= 16 * len(rows):
+            square = np.zeros((1 << k, 1 << k), dtype=bool)
+            square[rows, cols] = True
+            return self._union(node, self._build(square, k))
+        half = 1 << (k - 1)
+        south, east = rows >= half, cols >= half
+        quadrants = []
+        for child, mask, row, col in ((node.nw, ~south & ~east, 0, 0), (node.ne, ~south & east, 0, half),
+                                      (node.sw, south & ~east, half, 0), (node.se, south & east, half, half)):
+            quadrants.append(self._add(child, rows[mask] - row, cols[mask] - col))
+        return self._join(*quadrants)
+
+    def _union(self, a, b):
+        # Cells live in either of two nodes of the same level
+        if b.population == 0 or a is b:
+            return a
+        if a.population == 0:
+            return b
+        if a.k == 0:
+            return ON
+        return self._join(self._union(a.nw, b.nw), self._union(a.ne, b.ne), self._union(a.sw, b.sw),
+                          self._union(a.se, b.se))
+
+    def _build(self, cells, k):
+        # Quadtree for a 2**k x 2**k boolean array, one level at a time from the cells up. Each level
+        # joins every distinct 2x2 block of the level below once, so repeated and empty areas are cheap.
+        nodes = [OFF, ON]
+        ids = cells.astype(np.int64)
+        for _ in range(k):
+            count = len(nodes)
+            # Number the distinct halves, then the distinct pairs of halves, with 1-D uniques
+            _, top = np.unique(ids[0::2, 0::2] * count + ids[0::2, 1::2], return_inverse=True)
+            bottoms, bottom = np.unique(ids[1::2, 0::2] * count + ids[1::2, 1::2], return_inverse=True)
+            _, first, inverse = np.unique(top * len(bottoms) + bottom, return_index=True, return_inverse=True)
+            blocks = np.stack((ids[0::2, 0::2], ids[0::2, 1::2], ids[1::2, 0::2], ids[1::2, 1::2]), axis=-1)
+            nodes = [self._join(nodes[nw], nodes[ne], nodes[sw], nodes[se])
+                     for nw, ne, sw, se in blocks.reshape(-1, 4)[first].tolist()]
+            ids = inverse.reshape(blocks.shape[:2])
+        return nodes[ids[0, 0]]
+
+    def load(self, grid):
+        cells = np.asarray(grid, dtype=bool)
+        k = 3
+        while (1 << k) < max(cells.shape):
+            k += 1
+        square = np.zeros((1 << k, 1 << k), dtype=bool)
+        square[:cells.shape[0], :cells.shape[1]] = cells
+        self.root = self._build(square, k)
+        self.origin = (0, 0)
+
+    @property
+    def population(self):
+        return self.root.population
+
+    def live_cells(self):
+        stack = [(self.root, self.origin[0], self.origin[1])]
+        while stack:
+            node, row, col = stack.pop()
+            if node.population == 0:
+                continue
+            if node.k == 0:
+                yield row, col
+                continue
+            half = 1 << (node.k - 1)
+            stack.extend(((node.nw, row, col), (node.ne, row, col + half),
+                          (node.sw, row + half, col), (node.se, row + half, col + half)))
+
+    def to_list(self):
+        # Window [0, rows) x [0, cols) of the unbounded universe
+        grid = [[0 for _ in range(self.cols)] for _ in range(self.rows)]
+        for row, col in self.live_cells():
+            if 0 <= row < self.rows and 0 <= col < self.cols:
+                grid[row][col] = 1
+        return grid
+
+
+ENGINES[HashLifeEngine.name] = HashLifeEngine
@@ -0,0 +1,167 @@
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+import checkpoint
+import cycles
+import life
+import patterns
+import rules
+
+
+def _next_stop(generation, every, target):
+    # First multiple of every after generation, capped at target
+    return min(target, (generation // every + 1) * every) if every else target
+
+
+# Batch Game of Life run without pygame: python -m headless life --size 2048 --generations 10000
+def run_life(args):
+    wrap = not args.no_wrap
+    if args.engine == "hashlife" and wrap:
+        raise SystemExit("The hashlife engine has no edges, run it with --no-wrap")
+    # Without --rule a pattern or checkpoint keeps its own rule, anything else runs B3/S23
+    options = {"rule": args.rule} if args.rule else {}
+
+    engine = None
+    if args.resume:
+        if not args.checkpoint_dir:
+            raise SystemExit("--resume needs --checkpoint-dir")
+        try:
+            engine = checkpoint.resume(args.checkpoint_dir, args.engine, **options)
+        except ValueError as e:
+            raise SystemExit(f"Cannot resume: {e}")
+        if engine is not None:
+            print(f"Resuming from generation {engine.generation}")
+    if engine is None and args.pattern:
+        engine = patterns.load_pattern(args.pattern, args.engine, args.size, args.size, wrap, **options)
+    elif engine is None:
+        size = args.size or 256
+        rng = np.random.default_rng(args.seed)
+        grid = rng.random((size, size)) < args.density
+        engine = life.make_engine(args.engine, size, size, wrap, grid, **options)
+
+    checkpointer = None
+    if args.checkpoint_dir:
+        checkpointer = checkpoint.Checkpointer(args.checkpoint_dir, args.checkpoint_every)
+        checkpointer.last_generation = engine.generation
+
+    detector = None
+    if args.cycles != "off":
+        detector = cycles.CycleDetector(args.cycle_history)
+        detector.reset(engine)
+
+    # --generations is the generation to reach, so a resumed run stops where the original would have
+    first_generation = engine.generation
+    start = time.perf_counter()
+    try:
+        while engine.generation < args.generations:
+            stop = min(_next_stop(engine.generation, args.report_every, args.generations),
+                       _next_stop(engine.generation, args.checkpoint_dir and args.checkpoint_every,
+                                  args.generations))
+            if detector:
+                # The detector has to see every generation
+                stop = engine.generation + 1
+            engine.step(stop - engine.generation)
+            if detector and detector.observe(engine):
+                cycle = detector.cycle
+                print(f"{cycle.kind} from generation {cycle.start} with period {cycle.period}")
+                if args.cycles == "stop":
+                    break
+                # The board repeats every period generations, only the remainder has to be simulated
+                target = args.generations
+                engine.step((target - engine.generation) % cycle.period)
+                engine.generation = target
+            if checkpointer:
+                checkpointer.maybe_save(engine)
+            if args.report_every and engine.generation % args.report_every == 0:
+                elapsed = time.perf_counter() - start
+                print(f"generation {engine.generation}: {(engine.generation - first_generation) / elapsed:.1f} gen/s, "
+                      f"population {engine.population}")
+        if checkpointer and checkpointer.last_generation != engine.generation:
+            checkpointer.save(engine)
+    finally:
+        if checkpointer:
+            checkpointer.close()
+        if hasattr(engine, "close"):
+            engine.close()
+    elapsed = time.perf_counter() - start
+    if args.save:
+        patterns.save_pattern(engine, args.save)
+
+    generations = engine.generation - first_generation
+    rate = generations / elapsed if elapsed else float("inf")
+    print(f"{args.engine} {engine.rule}: {engine.rows}x{engine.cols}, {generations} generations in {elapsed:.3f}s "
+          f"({rate:.1f} gen/s), population {engine.population}")
+    return {"generations": generations, "seconds": elapsed, "generations_per_second": rate,
+            "population": engine.population}
+
+
+# Rule-space sweep: python -m headless rules --rules B3/S23 highlife daynight seeds --soups 1000
+def run_rules(args):
+    seeds = range(args.seed, args.seed + args.soups)
+    report = rules.sweep(args.rules, seeds, args.size, args.generations, args.density, args.batch, args.workers)
+    boards = len(report["results"])
+    print(f"{boards} soups of {args.size}x{args.size}, up to {args.generations} generations in "
+          f"{report['seconds']:.2f}s ({boards / report['seconds']:.1f} soups/s)")
+    for rule, entry in report["summary"].items():
+        print(f"{rule:16} extinct {entry['extinct'] / entry['soups']:6.1%}  still {entry['still'] / entry['soups']:6.1%}"
+              f"  active {entry['active'] / entry['soups']:6.1%}  mean density {entry['mean_density']:.3f}")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file)
+    return report
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m headless", description="Simulations without a window")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    life_parser = commands.add_parser("life", help="Run the Game of Life")
+    life_parser.add_argument("--size", type=int, default=None,
+                             help="Board width and height (default 256, or the size of --pattern)")
+    life_parser.add_argument("--generations", type=int, default=1000, help="Generation to stop at")
+    life_parser.add_argument("--engine", choices=life.engine_names(), default="numpy")
+    life_parser.add_argument("--density", type=float, default=0.3, help="Share of live cells in the random soup")
+    life_parser.add_argument("--seed", type=int, default=0)
+    life_parser.add_argument("--no-wrap", action="store_true", help="Dead cells outside the board instead of wrapping")
+    life_parser.add_argument("--pattern", help="Start from an .rle or .cells file instead of a random soup")
+    life_parser.add_argument("--save", help="Write the final board to an .rle or .cells file")
+    life_parser.add_argument("--checkpoint-dir", help="Write periodic checkpoints to this directory")
+    life_parser.add_argument("--checkpoint-every", type=int, default=1000, metavar="N",
+                             help="Generations between checkpoints")
+    life_parser.add_argument("--resume", action="store_true", help="Continue from the newest checkpoint")
+    life_parser.add_argument("--cycles", choices=("off", "stop", "skip"), default="off",
+                             help="Detect extinction, still lifes and cycles, then stop or skip to the end")
+    life_parser.add_argument("--cycle-history", type=int, default=4096, metavar="N",
+                             help="Generations remembered, the longest period that can be detected")
+    life_parser.add_argument("--report-every", type=int, default=0, metavar="N",
+                             help="Print progress every N generations")
+    life_parser.add_argument("--rule", help="B/S rulestring such as B36/S23, or a name like highlife")
+    life_parser.set_defaults(handler=run_life)
+
+    rules_parser = commands.add_parser("rules", help="Run many rules on many random soups")
+    rules_parser.add_argument("--rules", nargs="+", default=[rules.CONWAY],
+                              help=f"Rulestrings or names ({', '.join(rules.NAMED_RULES)})")
+    rules_parser.add_argument("--soups", type=int, default=100, help="Random soups per rule")
+    rules_parser.add_argument("--size", type=int, default=64)
+    rules_parser.add_argument("--generations", type=int, default=500)
+    rules_parser.add_argument("--density", type=float, default=0.5)
+    rules_parser.add_argument("--seed", type=int, default=0, help="Seed of the first soup")
+    rules_parser.add_argument("--batch", type=int, default=256, help="Soups stepped together as one array")
+    rules_parser.add_argument("--workers", type=int, default=1, help="Processes sharing the batches")
+    rules_parser.add_argument("--output", help="Write every soup's result to this JSON file")
+    rules_parser.set_defaults(handler=run_rules)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,471 @@
+import importlib
+from collections import Counter
+
+import numpy as np
+from typing import List
+
+import rules
+
+
+# Reference step on a list-of-lists grid, B3/S23 unless another rule is given
+def update_grid(grid: List[List[int]], wrap: bool = True, rule=None) -> List[List[int]]:
+    lookup = rules.parse_rule(rule).lookup
+    rows = len(grid)
+    cols = len(grid[0]) if rows else 0
+    new_grid = [[0 for _ in range(cols)] for _ in range(rows)]
+    for row in range(rows):
+        for col in range(cols):
+            neighbors = 0
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    if dr == 0 and dc == 0:
+                        continue
+                    r, c = row + dr, col + dc
+                    if wrap:
+                        neighbors += grid[r % rows][c % cols]
+                    elif 0 <= r < rows and 0 <= c < cols:
+                        neighbors += grid[r][c]
+            new_grid[row][col] = lookup[grid[row][col]][neighbors]
+    return new_grid
+
+
+# (rows, cols) of every cell covered by a batch of runs
+def expand_runs(rows, cols, lengths):
+    firsts = np.cumsum(lengths) - lengths
+    offsets = np.arange(int(lengths.sum())) - np.repeat(firsts, lengths)
+    return np.repeat(rows, lengths), np.repeat(cols, lengths) + offsets
+
+
+# Common interface of the stepping engines
+class LifeEngine:
+    name = "base"
+    unbounded = False
+
+    def __init__(self, rows, cols, wrap=True, rule=None):
+        self.rows = rows
+        self.cols = cols
+        self.wrap = wrap  # True: toroidal board, False: cells outside the board are dead
+        self.rule = rules.parse_rule(rule)  # B3/S23 by default
+        self.generation = 0
+
+    def get_cell(self, row, col):
+        raise NotImplementedError
+
+    def set_cell(self, row, col, value):
+        raise NotImplementedError
+
+    def toggle(self, row, col):
+        self.set_cell(row, col, 1 - self.get_cell(row, col))
+
+    def _clip_run(self, row, col, length):
+        # Part of a run inside the board, None when the row is off the board
+        if not 0 <= row < self.rows:
+            return None
+        start, stop = max(col, 0), min(col + length, self.cols)
+        return (start, stop) if start < stop else None
+
+    def set_run(self, row, col, length):
+        # Turn on length cells starting at (row, col), used by the pattern readers
+        span = self._clip_run(row, col, length)
+        if span:
+            for c in range(*span):
+                self.set_cell(row, c, 1)
+
+    def set_runs(self, rows, cols, lengths):
+        # Batch of runs as three equal-length integer arrays
+        for row, col, length in zip(rows.tolist(), cols.tolist(), lengths.tolist()):
+            self.set_run(row, col, length)
+
+    def _clip_runs(self, rows, cols, lengths):
+        # Vectorized _clip_run: (rows, cols) of every live cell inside the board
+        starts = np.maximum(cols, 0)
+        stops = np.minimum(cols + lengths, self.cols)
+        keep = (rows >= 0) & (rows < self.rows) & (starts < stops)
+        return expand_runs(rows[keep], starts[keep], (stops - starts)[keep])
+
+    def step(self, generations=1):
+        raise NotImplementedError
+
+    def changed_cells(self):
+        # (rows, cols) arrays of the cells flipped by the last generation of the last step,
+        # None before the first step or when the engine does not keep the previous generation
+        return None
+
+    @property
+    def population(self):
+        return sum(map(sum, self.to_list()))
+
+    def to_list(self) -> List[List[int]]:
+        return [[self.get_cell(row, col) for col in range(self.cols)] for row in range(self.rows)]
+
+    def to_array(self):
+        return np.array(self.to_list(), dtype=np.uint8).reshape(self.rows, self.cols)
+
+    def live_cells(self):
+        rows, cols = np.nonzero(self.to_array())
+        return zip(rows.tolist(), cols.tolist())
+
+    def load(self, grid):
+        for row, values in enumerate(grid):
+            for col, value in enumerate(values):
+                self.set_cell(row, col, 1 if value else 0)
+
+
+# Plain Python engine, kept as the reference implementation
+class ListEngine(LifeEngine):
+    name = "list"
+
+    def __init__(self, rows, cols, wrap=True, rule=None):
+        super().__init__(rows, cols, wrap, rule)
+        self.grid = [[0 for _ in range(cols)] for _ in range(rows)]
+
+    def get_cell(self, row, col):
+        return self.grid[row][col]
+
+    def set_cell(self, row, col, value):
+        self.grid[row][col] = value
+
+    def set_run(self, row, col, length):
+        span = self._clip_run(row, col, length)
+        if span:
+            self.grid[row][span[0]:span[1]] = [1] * (span[1] - span[0])
+
+    def step(self, generations=1):
+        for _ in range(generations):
+            self.grid = update_grid(self.grid, self.wrap, self.rule)
+            self.generation += 1
+
+    def to_list(self):
+        return [row[:] for row in self.grid]
+
+
+# NumPy engine: one uint8 per cell, neighbours counted from shifted slices of a padded copy
+class NumpyEngine(LifeEngine):
+    name = "numpy"
+
+    def __init__(self, rows, cols, wrap=True, rule=None):
+        super().__init__(rows, cols, wrap, rule)
+        self.cells = np.zeros((rows, cols), dtype=np.uint8)
+        # Buffers reused every generation so stepping does not allocate
+        self._padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+        self._counts = np.zeros((rows, cols), dtype=np.uint8)
+        self._mask = np.zeros((rows, cols), dtype=bool)
+        # Other rules than B3/S23 go through the rule's lookup table
+        self._table_buffers = None if self.rule.is_conway else rules.table_buffers((rows, cols))
+
+    def get_cell(self, row, col):
+        return int(self.cells[row, col])
+
+    def set_cell(self, row, col, value):
+        self.cells[row, col] = value
+
+    def set_run(self, row, col, length):
+        span = self._clip_run(row, col, length)
+        if span:
+            self.cells[row, span[0]:span[1]] = 1
+
+    def set_runs(self, rows, cols, lengths):
+        self.cells[self._clip_runs(rows, cols, lengths)] = 1
+
+    def load(self, grid):
+        self.cells[...] = np.asarray(grid, dtype=bool)
+
+    @property
+    def population(self):
+        return int(np.count_nonzero(self.cells))
+
+    def to_list(self):
+        return self.cells.tolist()
+
+    def to_array(self):
+        return self.cells.copy()
+
+    def _fill_padding(self):
+        cells, padded = self.cells, self._padded
+        padded[1:-1, 1:-1] = cells
+        if self.wrap:
+            # Same neighbours as the modulo indexing of update_grid
+            padded[0, 1:-1] = cells[-1]
+            padded[-1, 1:-1] = cells[0]
+            padded[1:-1, 0] = cells[:, -1]
+            padded[1:-1, -1] = cells[:, 0]
+            padded[0, 0] = cells[-1, -1]
+            padded[0, -1] = cells[-1, 0]
+            padded[-1, 0] = cells[0, -1]
+            padded[-1, -1] = cells[0, 0]
+        # Fixed boundary: the border of the padded buffer is never written and stays 0
+
+    def step(self, generations=1):
+        for _ in range(generations):
+            self._fill_padding()
+            if self._table_buffers is None:
+                step_padded(self._padded, self.cells, self._counts, self._mask)
+            else:
+                rules.step_table(self._padded, self.cells, self.rule.bits, self._table_buffers)
+            self.generation += 1
+
+    def changed_cells(self):
+        # The padded buffer still holds the previous generation
+        if self.generation == 0:
+            return None
+        return np.nonzero(self._padded[1:-1, 1:-1] != self.cells)
+
+
+# Next generation of the interior of a padded uint8 array, written into out
+def step_padded(padded, out, counts=None, mask=None):
+    rows, cols = out.shape
+    if counts is None:
+        counts = np.empty((rows, cols), dtype=np.uint8)
+        mask = np.empty((rows, cols), dtype=bool)
+    np.add(padded[:-2, :-2], padded[:-2, 1:-1], out=counts)
+    for dr, dc in ((0, 2), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2)):
+        counts += padded[dr:dr + rows, dc:dc + cols]
+    # Born with 3 neighbours, survives with 2 or 3
+    np.equal(counts, 2, out=mask)
+    mask &= padded[1:-1, 1:-1].view(bool)
+    mask |= counts == 3
+    out[...] = mask
+
+
+NEIGHBOUR_OFFSETS = tuple((dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc)
+
+
+# Sparse engine: only live cells are stored, each generation visits live cells and their neighbours
+class SparseEngine(LifeEngine):
+    name = "sparse"
+
+    def __init__(self, rows, cols, wrap=True, unbounded=False, rule=None):
+        super().__init__(rows, cols, wrap and not unbounded, rule)
+        if 0 in self.rule.birth:
+            raise ValueError("The sparse engine only stores live cells, B0 rules fill the whole board")
+        self.unbounded = unbounded  # No edges at all, rows x cols is only the window used by to_list
+        self.cells = set()
+        self._previous = None
+
+    def get_cell(self, row, col):
+        return 1 if (row, col) in self.cells else 0
+
+    def set_cell(self, row, col, value):
+        if value:
+            self.cells.add((row, col))
+        else:
+            self.cells.discard((row, col))
+
+    def set_run(self, row, col, length):
+        span = (col, col + length) if self.unbounded else self._clip_run(row, col, length)
+        if span:
+            self.cells.update((row, c) for c in range(*span))
+
+    def set_runs(self, rows, cols, lengths):
+        if self.unbounded:
+            rows, cols = expand_runs(rows, cols, lengths)
+        else:
+            rows, cols = self._clip_runs(rows, cols, lengths)
+        self.cells.update(zip(rows.tolist(), cols.tolist()))
+
+    def load(self, grid):
+        rows, cols = np.nonzero(np.asarray(grid))
+        self.cells = set(zip(rows.tolist(), cols.tolist()))
+
+    @property
+    def population(self):
+        return len(self.cells)
+
+    def live_cells(self):
+        return iter(self.cells)
+
+    def step(self, generations=1):
+        rows, cols = self.rows, self.cols
+        birth, survival = self.rule.birth, self.rule.survival
+        for _ in range(generations):
+            live = self.cells
+            if self.wrap:
+                counts = Counter(((r + dr) % rows, (c + dc) % cols)
+                                 for r, c in live for dr, dc in NEIGHBOUR_OFFSETS)
+            else:
+                counts = Counter((r + dr, c + dc) for r, c in live for dr, dc in NEIGHBOUR_OFFSETS)
+            cells = {cell for cell, n in counts.items() if n in (survival if cell in live else birth)}
+            if 0 in survival:
+                # Cells without neighbours never show up in counts
+                cells.update(cell for cell in live if cell not in counts)
+            if not (self.wrap or self.unbounded):
+                cells = {(r, c) for r, c in cells if 0 <= r < rows and 0 <= c < cols}
+            self._previous, self.cells = live, cells
+            self.generation += 1
+
+    def changed_cells(self):
+        if self._previous is None:
+            return None
+        flipped = np.array(list(self._previous ^ self.cells), dtype=np.int64).reshape(-1, 2)
+        return flipped[:, 0], flipped[:, 1]
+
+    def to_list(self):
+        grid = [[0 for _ in range(self.cols)] for _ in range(self.rows)]
+        for row, col in self.cells:
+            if 0 <= row < self.rows and 0 <= col < self.cols:
+                grid[row][col] = 1
+        return grid
+
+
+ONE = np.uint64(1)
+SIGN_SHIFT = np.uint64(63)
+
+
+def _popcount(words):
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum(dtype=np.int64))
+    return int(np.unpackbits(words.view(np.uint8)).sum(dtype=np.int64))
+
+
+# Bit-packed engine: 64 cells per uint64 word, a generation is bitwise adder logic over whole words
+class BitPackedEngine(LifeEngine):
+    name = "bitpacked"
+
+    def __init__(self, rows, cols, wrap=True, rule=None):
+        super().__init__(rows, cols, wrap, rule)
+        # Column c lives in bit c % 64 of word c // 64, bits past the last column are kept at 0
+        self.words = np.zeros((rows, (cols + 63) // 64), dtype="<u8")
+        self._last_bit = np.uint64((cols - 1) % 64)
+        self._tail_mask = np.uint64((1 << ((cols - 1) % 64 + 1)) - 1)
+        self._previous = None
+
+    def get_cell(self, row, col):
+        return int(self.words[row, col >> 6] >> np.uint64(col & 63)) & 1
+
+    def set_cell(self, row, col, value):
+        bit = ONE << np.uint64(col & 63)
+        if value:
+            self.words[row, col >> 6] |= bit
+        else:
+            self.words[row, col >> 6] &= ~bit
+
+    def set_run(self, row, col, length):
+        span = self._clip_run(row, col, length)
+        if not span:
+            return
+        start, stop = span
+        words = self.words[row]
+        for index in range(start >> 6, ((stop - 1) >> 6) + 1):
+            low = max(start - index * 64, 0)
+            high = min(stop - index * 64, 64)
+            words[index] |= np.uint64(((1 << (high - low)) - 1) << low)
+
+    def set_runs(self, rows, cols, lengths):
+        rows, cols = self._clip_runs(rows, cols, lengths)
+        np.bitwise_or.at(self.words, (rows, cols >> 6), ONE << (cols & 63).astype(np.uint64))
+
+    def load(self, grid):
+        cells = np.asarray(grid, dtype=bool)
+        packed = np.packbits(cells, axis=1, bitorder="little")
+        data = self.words.view(np.uint8)
+        data[...] = 0
+        data[:, :packed.shape[1]] = packed
+
+    @property
+    def population(self):
+        return _popcount(self.words)
+
+    def to_array(self):
+        bits = np.unpackbits(self.words.view(np.uint8), axis=1, bitorder="little")
+        return bits[:, :self.cols].copy()
+
+    def to_list(self):
+        return self.to_array().tolist()
+
+    def _shift_rows(self, words, down):
+        # Row r of the result holds row r - 1 (down) or r + 1 (up) of words
+        if self.wrap:
+            return np.roll(words, 1 if down else -1, axis=0)
+        shifted = np.zeros_like(words)
+        if down:
+            shifted[1:] = words[:-1]
+        else:
+            shifted[:-1] = words[1:]
+        return shifted
+
+    def step(self, generations=1):
+        for _ in range(generations):
+            alive = self.words
+            # West and east neighbours of every cell, carrying bits across word boundaries
+            west = alive << ONE
+            west[:, 1:] |= alive[:, :-1] >> SIGN_SHIFT
+            east = alive >> ONE
+            east[:, :-1] |= alive[:, 1:] << SIGN_SHIFT
+            if self.wrap:
+                west[:, 0] |= (alive[:, -1] >> self._last_bit) & ONE
+                east[:, -1] |= (alive[:, 0] & ONE) << self._last_bit
+            # Two-bit sums: three cells of a row, and the two side neighbours of the centre row
+            row_sum0 = west ^ alive ^ east
+            row_sum1 = (west & alive) | (east & (west ^ alive))
+            mid_sum0 = west ^ east
+            mid_sum1 = west & east
+            up0, up1 = self._shift_rows(row_sum0, True), self._shift_rows(row_sum1, True)
+            down0, down1 = self._shift_rows(row_sum0, False), self._shift_rows(row_sum1, False)
+            # Add up + mid + down: bit 0 of the count, then whether the upper bits equal exactly 1
+            count0 = up0 ^ mid_sum0 ^ down0
+            carry0 = (up0 & mid_sum0) | (down0 & (up0 ^ mid_sum0))
+            twos = up1 ^ mid_sum1 ^ down1
+            fours = (up1 & mid_sum1) | (down1 & (up1 ^ mid_sum1))
+            if self.rule.is_conway:
+                count_is_2_or_3 = (twos ^ carry0) & ~fours
+                # Born with 3 neighbours, survives with 2 or 3
+                alive = count_is_2_or_3 & (count0 | alive)
+            else:
+                # Full four-bit count: count0 + 2 * (carry0 + twos) + 4 * fours
+                eights = carry0 & twos
+                planes = (count0, carry0 ^ twos, fours ^ eights, fours & eights)
+                alive = self._apply_rule(alive, planes)
+            alive[:, -1] &= self._tail_mask
+            self._previous, self.words = self.words, alive
+            self.generation += 1
+
+    def _apply_rule(self, alive, planes):
+        # Any B/S rule on bit planes: a cell matches count n when every plane has the bit of n
+        born = np.zeros_like(alive)
+        survives = np.zeros_like(alive)
+        for counts, result in ((self.rule.birth, born), (self.rule.survival, survives)):
+            for n in counts:
+                match = ~np.zeros_like(alive)
+                for bit, plane in enumerate(planes):
+                    match &= plane if n >> bit & 1 else ~plane
+                result |= match
+        return (born & ~alive) | (survives & alive)
+
+    def changed_cells(self):
+        if self._previous is None:
+            return None
+        diff = self._previous ^ self.words
+        rows, words = np.nonzero(diff)
+        bits = np.unpackbits(diff[rows, words].view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+        index, bit = np.nonzero(bits)
+        return rows[index], words[index] * 64 + bit
+
+
+ENGINES = {
+    ListEngine.name: ListEngine,
+    NumpyEngine.name: NumpyEngine,
+    SparseEngine.name: SparseEngine,
+    BitPackedEngine.name: BitPackedEngine,
+}
+
+
+# Engines in their own modules register themselves when imported
+OPTIONAL_ENGINES = {
+    "hashlife": "hashlife",
+    "parallel": "life_parallel",
+}
+
+
+def engine_names():
+    return sorted(set(ENGINES) | set(OPTIONAL_ENGINES))
+
+
+def make_engine(name, rows, cols, wrap=True, grid=None, **options):
+    if name not in ENGINES and name in OPTIONAL_ENGINES:
+        importlib.import_module(OPTIONAL_ENGINES[name])
+    if name not in ENGINES:
+        raise ValueError(f"Unknown Game of Life engine: {name}")
+    engine = ENGINES[name](rows, cols, wrap, **options)
+    if grid is not None:
+        engine.load(grid)
+    return engine
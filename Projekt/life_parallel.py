@@ -0,0 +1,165 @@
+import argparse
+import os
+import time
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+import rules
+from life import ENGINES, LifeEngine, NumpyEngine, step_padded
+
+# Shared buffers attached once per worker process
+_worker_memory = []
+_worker_buffers = []
+
+
+def _init_worker(names, shape):
+    for name in names:
+        # Pool workers share the owner's resource tracker, which unlinks the blocks on close
+        memory = SharedMemory(name=name)
+        _worker_memory.append(memory)
+        _worker_buffers.append(np.ndarray(shape, dtype=np.uint8, buffer=memory.buf))
+
+
+def _step_tile(task):
+    # Step rows [start, stop) of buffer src into the other buffer, reading one halo row on each side
+    src, start, stop, wrap, rule_bits = task
+    cells, out = _worker_buffers[src], _worker_buffers[1 - src]
+    rows, cols = cells.shape
+    padded = np.zeros((stop - start + 2, cols + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = cells[start:stop]
+    if wrap or start > 0:
+        padded[0, 1:-1] = cells[(start - 1) % rows]
+    if wrap or stop < rows:
+        padded[-1, 1:-1] = cells[stop % rows]
+    if wrap:
+        padded[:, 0] = padded[:, -2]
+        padded[:, -1] = padded[:, 1]
+    if rule_bits is None:
+        step_padded(padded, out[start:stop])
+    else:
+        rules.step_table(padded, out[start:stop], rule_bits)
+
+
+# Tiled engine: horizontal tiles stepped on a process pool over two shared-memory buffers
+class ParallelEngine(LifeEngine):
+    name = "parallel"
+
+    def __init__(self, rows, cols, wrap=True, workers=None, tiles=None, rule=None):
+        super().__init__(rows, cols, wrap, rule)
+        self.workers = workers or os.cpu_count() or 1
+        tiles = min(rows, tiles or self.workers)
+        bounds = [rows * i // tiles for i in range(tiles + 1)]
+        self._tiles = list(zip(bounds[:-1], bounds[1:]))
+        self._memory = [SharedMemory(create=True, size=max(1, rows * cols)) for _ in range(2)]
+        self._buffers = [np.ndarray((rows, cols), dtype=np.uint8, buffer=m.buf) for m in self._memory]
+        for buffer in self._buffers:
+            buffer.fill(0)
+        self._current = 0
+        self._pool = None
+
+    @property
+    def cells(self):
+        return self._buffers[self._current]
+
+    def get_cell(self, row, col):
+        return int(self.cells[row, col])
+
+    def set_cell(self, row, col, value):
+        self.cells[row, col] = value
+
+    def set_run(self, row, col, length):
+        span = self._clip_run(row, col, length)
+        if span:
+            self.cells[row, span[0]:span[1]] = 1
+
+    def set_runs(self, rows, cols, lengths):
+        self.cells[self._clip_runs(rows, cols, lengths)] = 1
+
+    def load(self, grid):
+        self.cells[...] = np.asarray(grid, dtype=bool)
+
+    @property
+    def population(self):
+        return int(np.count_nonzero(self.cells))
+
+    def to_list(self):
+        return self.cells.tolist()
+
+    def to_array(self):
+        return self.cells.copy()
+
+    def step(self, generations=1):
+        if self._pool is None:
+            self._pool = Pool(self.workers, _init_worker,
+                              ([m.name for m in self._memory], (self.rows, self.cols)))
+        for _ in range(generations):
+            rule_bits = None if self.rule.is_conway else self.rule.bits
+            tasks = [(self._current, start, stop, self.wrap, rule_bits) for start, stop in self._tiles]
+            self._pool.map(_step_tile, tasks)
+            self._current = 1 - self._current
+            self.generation += 1
+
+    def changed_cells(self):
+        # The other buffer still holds the previous generation
+        if self.generation == 0:
+            return None
+        return np.nonzero(self._buffers[0] != self._buffers[1])
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        if self._memory:
+            self._buffers = [buffer.copy() for buffer in self._buffers]
+            for memory in self._memory:
+                memory.close()
+                memory.unlink()
+            self._memory = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+ENGINES[ParallelEngine.name] = ParallelEngine
+
+
+# Time the same run on 1..max_workers processes, checking every result against the serial engine
+def scaling_benchmark(size=2048, generations=20, max_workers=None, density=0.3, seed=0):
+    max_workers = max_workers or os.cpu_count() or 1
+    grid = np.random.default_rng(seed).random((size, size)) < density
+    serial = NumpyEngine(size, size)
+    serial.load(grid)
+    start = time.perf_counter()
+    serial.step(generations)
+    serial_time = time.perf_counter() - start
+
+    results = [{"workers": 0, "seconds": serial_time, "speedup": 1.0}]
+    for workers in range(1, max_workers + 1):
+        with ParallelEngine(size, size, workers=workers) as engine:
+            engine.load(grid)
+            engine.step()  # Start the pool outside the timed region
+            engine.load(grid)
+            start = time.perf_counter()
+            engine.step(generations)
+            seconds = time.perf_counter() - start
+            if not np.array_equal(engine.cells, serial.cells):
+                raise AssertionError(f"Parallel result with {workers} workers differs from the serial step")
+        results.append({"workers": workers, "seconds": seconds, "speedup": serial_time / seconds})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Game of Life multi-core scaling benchmark")
+    parser.add_argument("--size", type=int, default=2048)
+    parser.add_argument("--generations", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    for result in scaling_benchmark(args.size, args.generations, args.workers):
+        label = "serial" if result["workers"] == 0 else f"{result['workers']} workers"
+        print(f"{label:>12}: {args.generations / result['seconds']:8.1f} gen/s  x{result['speedup']:.2f}")
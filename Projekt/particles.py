@@ -0,0 +1,93 @@
+import math
+
+import numpy as np
+import pygame
+
+MAX_RADIUS = 3
+# Pixel offsets of a disc of each radius
+_DISCS = [[(dx, dy) for dx in range(-r, r + 1) for dy in range(-r, r + 1) if math.hypot(dx, dy) <= r]
+          for r in range(MAX_RADIUS + 1)]
+
+
+# All particles in struct-of-arrays buffers; free slots are recycled through a stack
+class ParticleSystem:
+    def __init__(self, capacity=50000, gravity=240.0, seed=None):
+        self.capacity = capacity
+        self.gravity = gravity  # Pixels per second squared
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)  # Seconds left
+        self.radius = np.zeros(capacity, dtype=np.uint8)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self._free = np.arange(capacity - 1, -1, -1, dtype=np.int64)
+        self._free_count = capacity
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.capacity - self._free_count
+
+    def emit(self, x, y, count, color, speed=180.0, life=(0.4, 0.9)):
+        # Burst from (x, y); returns how many fitted in the free slots
+        count = min(count, self._free_count)
+        if not count:
+            return 0
+        slots = self._free[self._free_count - count:self._free_count]
+        self._free_count -= count
+        angle = self._rng.uniform(0, 2 * math.pi, count)
+        velocity = self._rng.uniform(0.2, 1.0, count) * speed
+        self.x[slots] = x
+        self.y[slots] = y
+        self.vx[slots] = np.cos(angle) * velocity
+        self.vy[slots] = np.sin(angle) * velocity - speed / 2  # Thrown upwards, then falling
+        self.life[slots] = self._rng.uniform(life[0], life[1], count)
+        self.radius[slots] = self._rng.integers(1, MAX_RADIUS + 1, count)
+        self.color[slots] = color
+        self.alive[slots] = True
+        return count
+
+    def update(self, dt):
+        # One pass over the whole buffers; dead slots move harmlessly until reused
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.vy += self.gravity * dt
+        self.life -= dt
+        dead = np.flatnonzero(self.alive & (self.life <= 0))
+        self.alive[dead] = False
+        self._free[self._free_count:self._free_count + len(dead)] = dead
+        self._free_count += len(dead)
+
+    def clear(self):
+        self.alive[:] = False
+        self._free[:] = np.arange(self.capacity - 1, -1, -1)
+        self._free_count = self.capacity
+
+    def draw(self, surface):
+        # Writes every particle straight into the surface pixels, one array assignment per radius
+        live = np.flatnonzero(self.alive)
+        if not len(live):
+            return
+        width, height = surface.get_size()
+        xs = self.x[live].astype(np.int64)
+        ys = self.y[live].astype(np.int64)
+        # Particles touching the border are skipped rather than clipped
+        inside = (xs >= MAX_RADIUS) & (xs < width - MAX_RADIUS) & (ys >= MAX_RADIUS) & (ys < height - MAX_RADIUS)
+        live, xs, ys = live[inside], xs[inside], ys[inside]
+        color = self.color[live].astype(np.uint32)
+        red, green, blue = surface.get_shifts()[:3]
+        mapped = color[:, 0] << red | color[:, 1] << green | color[:, 2] << blue
+        base = ys * width + xs
+        radius = self.radius[live]
+        pixels = pygame.surfarray.pixels2d(surface)
+        try:
+            flat = pixels.T.reshape(-1)  # A view while rows are tightly packed
+            if not np.shares_memory(flat, pixels):
+                return
+            for r in range(1, MAX_RADIUS + 1):
+                group = radius == r
+                deltas = np.array([dy * width + dx for dx, dy in _DISCS[r]])
+                flat[(base[group, None] + deltas).ravel()] = np.repeat(mapped[group], len(deltas))
+        finally:
+            del pixels  # Unlocks the surface
@@ -0,0 +1,254 @@
+import os
+import re
+from array import array
+
+import numpy as np
+
+import life
+import rules
+
+CHUNK_SIZE = 1 << 16
+RLE_LINE_LENGTH = 70
+ROW_BLOCK = 256  # Rows converted to runs at a time when saving dense boards
+
+_HEADER_FIELD = re.compile(r"(\w+)\s*=\s*([^,]+)")
+_RLE_BYTES = np.frombuffer(b"0123456789.$!" + bytes(range(65, 91)) + bytes(range(97, 123)), dtype=np.uint8)
+_CELLS_RUN = re.compile(r"[Oo*]+")
+
+
+def _batch(rows, cols, lengths):
+    return (np.frombuffer(rows, dtype=np.int64), np.frombuffer(cols, dtype=np.int64),
+            np.frombuffer(lengths, dtype=np.int64))
+
+
+# ---------- RLE ----------
+def read_rle_header(file):
+    # Skips '#' comment lines and returns the "x = ..., y = ..., rule = ..." fields
+    while True:
+        line = file.readline()
+        if not line:
+            raise ValueError("RLE file has no header line")
+        line = line.strip()
+        if line and not line.startswith("#"):
+            break
+    header = {key: value.strip() for key, value in _HEADER_FIELD.findall(line)}
+    if "x" not in header or "y" not in header:
+        raise ValueError(f"Invalid RLE header: {line}")
+    header["x"] = int(header["x"])
+    header["y"] = int(header["y"])
+    header.setdefault("rule", "B3/S23")
+    return header
+
+
+def _parse_rle_chunk(data, row, col):
+    # Vectorized decoding of complete "<count><tag>" tokens; returns the live runs and the new position
+    digit = (data >= 48) & (data <= 57)
+    tag_index = np.flatnonzero(~digit)
+    tags = data[tag_index]
+    end = np.flatnonzero(tags == ord("!"))
+    done = len(end) > 0
+    if done:
+        tag_index, tags = tag_index[:end[0]], tags[:end[0]]
+    empty = np.zeros(0, dtype=np.int64)
+    if not len(tags):
+        return (empty, empty, empty), row, col, done
+
+    # Each digit belongs to the tag that follows it
+    digit_index = np.flatnonzero(digit[:tag_index[-1]])
+    owner = np.searchsorted(tag_index, digit_index)
+    values = (data[digit_index] - 48).astype(np.int64) * 10 ** (tag_index[owner] - digit_index - 1)
+    counts = np.zeros(len(tags), dtype=np.int64)
+    np.add.at(counts, owner, values)
+    counts[np.bincount(owner, minlength=len(tags)) == 0] = 1
+
+    # Row of every token, and its column counted from the last "$" (or the carried column)
+    newline = tags == ord("$")
+    rows = row + np.cumsum(np.where(newline, counts, 0))
+    advance = np.where(newline, 0, counts)
+    before = np.cumsum(advance) - advance
+    last_newline = np.maximum.accumulate(np.where(newline, np.arange(len(tags)), -1))
+    cols = np.where(last_newline >= 0, before - before[np.maximum(last_newline, 0)], col + before)
+
+    # "o" and the extra states of multi-state RLE are all live
+    live = ~newline & (tags != ord("b")) & (tags != ord("."))
+    return ((rows[live], cols[live], counts[live]), int(rows[-1]),
+            int(cols[-1] + advance[-1]), done)
+
+
+def rle_runs(file):
+    # Yields one (rows, cols, lengths) batch of live runs per chunk read from the file
+    row = col = 0
+    pending = b""  # Digits of a count cut off at the end of a chunk
+    done = False
+    while not done:
+        chunk = file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        data = np.frombuffer(pending + chunk.encode("ascii", "ignore"), dtype=np.uint8)
+        data = data[np.isin(data, _RLE_BYTES)]
+        # Keep a trailing count for the next chunk
+        tags = np.flatnonzero((data < 48) | (data > 57))
+        end = int(tags[-1]) + 1 if len(tags) else 0
+        pending = data[end:].tobytes()
+        runs, row, col, done = _parse_rle_chunk(data[:end], row, col)
+        if len(runs[0]):
+            yield runs
+
+
+def read_rle(file, engine, offset=(0, 0)):
+    # Decodes an RLE stream straight into an existing engine and returns the header
+    header = read_rle_header(file)
+    for rows, cols, lengths in rle_runs(file):
+        engine.set_runs(rows + offset[0], cols + offset[1], lengths)
+    return header
+
+
+def _runs_from_cells(rows, cols):
+    # Sorted live cells -> runs of horizontally adjacent cells
+    if len(rows) == 0:
+        return rows, cols, rows
+    breaks = np.flatnonzero((np.diff(rows) != 0) | (np.diff(cols) != 1)) + 1
+    starts = np.concatenate(([0], breaks))
+    lengths = np.diff(np.concatenate((starts, [len(rows)])))
+    return rows[starts], cols[starts], lengths
+
+
+def live_runs(engine):
+    # Yields (rows, cols, lengths) batches of live runs in row-major order
+    if engine.name in ("sparse", "hashlife"):
+        cells = np.array(sorted(engine.live_cells()), dtype=np.int64).reshape(-1, 2)
+        yield _runs_from_cells(cells[:, 0], cells[:, 1])
+        return
+    board = engine.to_array()
+    for top in range(0, engine.rows, ROW_BLOCK):
+        block = board[top:top + ROW_BLOCK].astype(np.int8)
+        edges = np.diff(block, axis=1, prepend=0, append=0)
+        rows, starts = np.nonzero(edges == 1)
+        stops = np.nonzero(edges == -1)[1]
+        if len(rows):
+            yield rows + top, starts, stops - starts
+
+
+def _bounding_box(engine):
+    top = left = bottom = right = None
+    for rows, cols, lengths in live_runs(engine):
+        if not len(rows):
+            continue
+        top = int(rows[0]) if top is None else top
+        bottom = int(rows[-1])
+        left = int(cols.min()) if left is None else min(left, int(cols.min()))
+        right = int((cols + lengths).max()) if right is None else max(right, int((cols + lengths).max()))
+    if top is None:
+        return 0, 0, 0, 0
+    return top, left, bottom + 1, right
+
+
+def write_rle(engine, file, rule=None):
+    # The rule defaults to the one the engine runs
+    rule = rules.parse_rule(rule or engine.rule).rulestring
+    top, left, bottom, right = _bounding_box(engine)
+    file.write(f"#C generation {engine.generation}\n")
+    file.write(f"x = {right - left}, y = {bottom - top}, rule = {rule}\n")
+
+    line = []
+    line_length = 0
+
+    def emit(count, tag):
+        nonlocal line_length
+        token = f"{count}{tag}" if count > 1 else tag
+        if line_length + len(token) > RLE_LINE_LENGTH:
+            file.write("".join(line) + "\n")
+            line.clear()
+            line_length = 0
+        line.append(token)
+        line_length += len(token)
+
+    row, col = top, left
+    for rows, cols, lengths in live_runs(engine):
+        for run_row, run_col, length in zip(rows.tolist(), cols.tolist(), lengths.tolist()):
+            if run_row > row:
+                emit(run_row - row, "$")
+                row, col = run_row, left
+            if run_col > col:
+                emit(run_col - col, "b")
+            emit(length, "o")
+            col = run_col + length
+    emit(1, "!")
+    file.write("".join(line) + "\n")
+
+
+# ---------- Plaintext (.cells) ----------
+def _cells_lines(file):
+    for line in file:
+        line = line.rstrip("\r\n")
+        if not line.startswith("!"):
+            yield line
+
+
+def cells_size(file):
+    rows = cols = 0
+    for rows, line in enumerate(_cells_lines(file), start=1):
+        cols = max(cols, len(line.rstrip(".")))
+    return rows, cols
+
+
+def read_cells(file, engine, offset=(0, 0)):
+    rows, cols, lengths = array("q"), array("q"), array("q")
+    for row, line in enumerate(_cells_lines(file)):
+        for match in _CELLS_RUN.finditer(line):
+            rows.append(row + offset[0])
+            cols.append(match.start() + offset[1])
+            lengths.append(match.end() - match.start())
+        if len(lengths) >= CHUNK_SIZE:
+            engine.set_runs(*_batch(rows, cols, lengths))
+            rows, cols, lengths = array("q"), array("q"), array("q")
+    if lengths:
+        engine.set_runs(*_batch(rows, cols, lengths))
+
+
+def write_cells(engine, file, name=None):
+    top, left, bottom, right = _bounding_box(engine)
+    if name:
+        file.write(f"!Name: {name}\n")
+    row, col = top, left
+    line = []
+    for rows, cols, lengths in live_runs(engine):
+        for run_row, run_col, length in zip(rows.tolist(), cols.tolist(), lengths.tolist()):
+            while row < run_row:
+                file.write("".join(line) + "\n")
+                line = []
+                row, col = row + 1, left
+            line.append("." * (run_col - col) + "O" * length)
+            col = run_col + length
+    if bottom > top:
+        file.write("".join(line) + "\n")
+
+
+# ---------- Files ----------
+def load_pattern(path, engine="numpy", rows=None, cols=None, wrap=True, offset=(0, 0), **options):
+    # Streams a .rle or .cells file into engine, or into a new engine of that name sized to the pattern
+    # (running the rule of the RLE header unless a rule option is given)
+    is_rle = os.path.splitext(path)[1].lower() == ".rle"
+    if isinstance(engine, str):
+        with open(path, "r") as file:
+            if is_rle:
+                header = read_rle_header(file)
+                height, width = header["y"], header["x"]
+                options.setdefault("rule", header["rule"])
+            else:
+                height, width = cells_size(file)
+        engine = life.make_engine(engine, rows or height + offset[0], cols or width + offset[1], wrap, **options)
+    with open(path, "r") as file:
+        if is_rle:
+            read_rle(file, engine, offset)
+        else:
+            read_cells(file, engine, offset)
+    return engine
+
+
+def save_pattern(engine, path):
+    with open(path, "w") as file:
+        if os.path.splitext(path)[1].lower() == ".rle":
+            write_rle(engine, file)
+        else:
+            write_cells(engine, file, os.path.splitext(os.path.basename(path))[0])
@@ -0,0 +1,133 @@
+import csv
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import numpy as np
+
+WINDOW = 600  # Frames kept for the rolling statistics, 10 seconds at 60 FPS
+TRACE_LIMIT = 200000  # Trace events kept for export, oldest dropped first
+_DISABLED = nullcontext()
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+
+
+# Named timings per frame with rolling percentiles and a trace for offline analysis.
+# Disabled, every call returns after one attribute check.
+class Profiler:
+    def __init__(self, window=WINDOW, trace_limit=TRACE_LIMIT):
+        self.enabled = False
+        self.window = window
+        self.frame = 0
+        self.trace = deque(maxlen=trace_limit)  # (frame, scope, start, seconds)
+        self._samples = {}  # scope -> seconds per frame over the last window frames
+        self._counts = {}  # counter -> amount per frame over the last window frames
+        self._wall = deque(maxlen=window)  # Seconds between frame starts, for rates
+        self._totals = {}
+        self._amounts = {}
+        self._frame_start = None
+        self._lap = None
+        self._origin = time.perf_counter()
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self._frame_start = self._lap = None  # The time spent disabled is not a frame
+
+    def scope(self, name):
+        # with profiler.scope("step"): ...
+        if not self.enabled:
+            return _DISABLED
+        return _Scope(self, name)
+
+    def lap(self, name):
+        # Time since the previous lap or the frame start, for loops that run their phases one after another
+        if not self.enabled or self._lap is None:
+            return
+        now = time.perf_counter()
+        self.record(name, self._lap, now)
+
+    def count(self, name, amount=1):
+        # Work done this frame, reported per second
+        if self.enabled:
+            self._amounts[name] = self._amounts.get(name, 0) + amount
+
+    def record(self, name, start, end):
+        self._totals[name] = self._totals.get(name, 0.0) + end - start
+        self.trace.append((self.frame, name, start - self._origin, end - start))
+        self._lap = end
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self._wall.append(now - self._frame_start)
+        self._frame_start = self._lap = now
+
+    def end_frame(self):
+        # Frame time is the work between begin_frame and end_frame, without the pacing wait
+        if not self.enabled or self._lap is None:
+            return
+        self.record("frame", self._frame_start, time.perf_counter())
+        for name, seconds in self._totals.items():
+            self._samples.setdefault(name, deque(maxlen=self.window)).append(seconds)
+        for name in set(self._counts) | set(self._amounts):
+            self._counts.setdefault(name, deque(maxlen=self.window)).append(self._amounts.get(name, 0))
+        self._totals.clear()
+        self._amounts.clear()
+        self._lap = None
+        self.frame += 1
+
+    def percentile(self, name, q):
+        samples = self._samples.get(name)
+        return float(np.percentile(samples, q)) if samples else 0.0
+
+    def rate(self, name):
+        # Amount per second over the frames whose wall time is known
+        counts = self._counts.get(name)
+        if not counts or not self._wall:
+            return 0.0
+        frames = min(len(counts), len(self._wall))
+        seconds = sum(list(self._wall)[-frames:])
+        return sum(list(counts)[-frames:]) / seconds if seconds else 0.0
+
+    def summary(self):
+        scopes = {name: {"p50_ms": self.percentile(name, 50) * 1000, "p99_ms": self.percentile(name, 99) * 1000,
+                         "frames": len(samples)} for name, samples in self._samples.items()}
+        rates = {name: self.rate(name) for name in self._counts}
+        return {"frames": self.frame, "scopes": scopes, "rates": rates}
+
+    def report(self):
+        # Overlay lines, frame first
+        summary = self.summary()
+        lines = [f"{name}: p50 {scope['p50_ms']:.2f} ms  p99 {scope['p99_ms']:.2f} ms"
+                 for name, scope in sorted(summary["scopes"].items(), key=lambda item: item[0] != "frame")]
+        lines += [f"{name}/s: {rate:.0f}" for name, rate in summary["rates"].items()]
+        return lines
+
+    def export(self, path):
+        # .csv: one trace event per row; anything else: JSON with the summary and the trace
+        path = str(path)
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["frame", "scope", "start", "seconds"])
+                writer.writerows(self.trace)
+        else:
+            trace = [{"frame": frame, "scope": name, "start": start, "seconds": seconds}
+                     for frame, name, start, seconds in self.trace]
+            with open(path, "w") as file:
+                json.dump({"summary": self.summary(), "trace": trace}, file)
@@ -0,0 +1,183 @@
+import re
+import time
+from functools import lru_cache
+from multiprocessing import Pool
+
+import numpy as np
+
+CONWAY = "B3/S23"
+
+# Well-known Life-like rules, usable by name wherever a rulestring is
+NAMED_RULES = {
+    "life": "B3/S23",
+    "highlife": "B36/S23",
+    "daynight": "B3678/S34678",
+    "seeds": "B2/S",
+    "maze": "B3/S12345",
+    "replicator": "B1357/S1357",
+    "2x2": "B36/S125",
+    "34life": "B34/S34",
+    "diamoeba": "B35678/S5678",
+    "morley": "B368/S245",
+    "lifewithoutdeath": "B3/S012345678",
+}
+
+_BS = re.compile(r"B([0-8]*)/?S([0-8]*)")
+_SB = re.compile(r"([0-8]*)/([0-8]*)")  # Older survival/birth notation, "23/3" is Conway's Life
+
+
+# Outer-totalistic rule: a dead cell with a neighbour count in birth is born, a live one in survival stays alive
+class Rule:
+    def __init__(self, birth, survival):
+        self.birth = frozenset(birth)
+        self.survival = frozenset(survival)
+        # Next state by [state][neighbour count]
+        self.table = np.zeros((2, 9), dtype=np.uint8)
+        self.table[0, sorted(self.birth)] = 1
+        self.table[1, sorted(self.survival)] = 1
+        self.lookup = tuple(tuple(int(value) for value in row) for row in self.table)
+        # The same table as bits, bit state * 9 + count, for the batched shift lookup
+        self.bits = sum(1 << (state * 9 + count) for state, row in enumerate(self.lookup)
+                        for count, value in enumerate(row) if value)
+
+    @property
+    def rulestring(self):
+        return "B" + "".join(map(str, sorted(self.birth))) + "/S" + "".join(map(str, sorted(self.survival)))
+
+    @property
+    def is_conway(self):
+        return self.rulestring == CONWAY
+
+    def __eq__(self, other):
+        return isinstance(other, Rule) and self.rulestring == other.rulestring
+
+    def __hash__(self):
+        return hash(self.rulestring)
+
+    def __str__(self):
+        return self.rulestring
+
+    def __repr__(self):
+        return f"Rule({self.rulestring!r})"
+
+
+def parse_rule(rule=None):
+    # "B36/S23", "b36s23", "23/36" or a name from NAMED_RULES; None is Conway's Life
+    if isinstance(rule, Rule):
+        return rule
+    return _parse(CONWAY if rule is None else str(rule))
+
+
+@lru_cache(maxsize=None)
+def _parse(text):
+    text = NAMED_RULES.get(text.strip().lower(), text).replace(" ", "").upper()
+    match = _BS.fullmatch(text)
+    if match:
+        birth, survival = match.groups()
+    else:
+        match = _SB.fullmatch(text)
+        if not match:
+            raise ValueError(f"Not a B/S rulestring: {text!r}")
+        survival, birth = match.groups()
+    return Rule(map(int, birth), map(int, survival))
+
+
+def table_buffers(shape):
+    # Scratch arrays for step_table on boards of this shape (optionally with a leading batch axis)
+    *batch, rows, cols = shape
+    return (np.empty((*batch, rows + 2, cols), dtype=np.uint8), np.empty(shape, dtype=np.uint8),
+            np.empty(shape, dtype=np.uint32))
+
+
+# Next generation of the interior of padded under any rule, written into out. Branch-free: the cell's
+# state * 9 + neighbour count selects a bit of rule_bits. A stack of boards steps in one pass, rule_bits
+# then has shape (boards, 1, 1) so every board can follow its own rule.
+def step_table(padded, out, rule_bits, buffers=None):
+    row_sums, index, shifted = buffers or table_buffers(out.shape)
+    np.add(padded[..., :-2], padded[..., 1:-1], out=row_sums)
+    row_sums += padded[..., 2:]
+    np.add(row_sums[..., :-2, :], row_sums[..., 1:-1, :], out=index)
+    index += row_sums[..., 2:, :]
+    # The 3x3 sum counts the centre once, eight more times gives state * 9 + count
+    np.left_shift(padded[..., 1:-1, 1:-1], 3, out=out)
+    index += out
+    np.right_shift(np.asarray(rule_bits, dtype=np.uint32), index, out=shifted)
+    np.bitwise_and(shifted, 1, out=out, casting="unsafe")
+
+
+def _pad_wrapped(cells, padded):
+    padded[:, 1:-1, 1:-1] = cells
+    padded[:, 0, 1:-1] = cells[:, -1]
+    padded[:, -1, 1:-1] = cells[:, 0]
+    padded[:, :, 0] = padded[:, :, -2]
+    padded[:, :, -1] = padded[:, :, 1]
+
+
+def _run_jobs(jobs, size, generations, density):
+    # One batch of (rulestring, seed) soups on wrapped boards; boards that die out or freeze are dropped early
+    rule_bits = np.array([parse_rule(rule).bits for rule, _ in jobs], dtype=np.uint32).reshape(-1, 1, 1)
+    cells = np.stack([np.random.default_rng(seed).random((size, size)) < density for _, seed in jobs])
+    cells = cells.astype(np.uint8)
+    active = np.arange(len(jobs))
+    results = [{"rule": parse_rule(rule).rulestring, "seed": seed, "fate": "active", "generation": generations,
+                "population": 0} for rule, seed in jobs]
+    padded = np.zeros((len(jobs), size + 2, size + 2), dtype=np.uint8)
+    buffers = table_buffers(cells.shape)
+    for generation in range(1, generations + 1):
+        _pad_wrapped(cells, padded)
+        step_table(padded, cells, rule_bits, buffers)
+        settled = ~np.any(padded[:, 1:-1, 1:-1] != cells, axis=(1, 2))
+        if settled.any():
+            populations = np.count_nonzero(cells[settled], axis=(1, 2))
+            # Unchanged since the previous generation, which is where the final state starts
+            for job, population in zip(active[settled].tolist(), populations.tolist()):
+                results[job].update(fate="extinct" if population == 0 else "still", generation=generation - 1,
+                                     population=population)
+            keep = ~settled
+            active, cells, rule_bits = active[keep], cells[keep], rule_bits[keep]
+            if not len(active):
+                break
+            padded = padded[keep]
+            buffers = table_buffers(cells.shape)
+    for job, population in zip(active.tolist(), np.count_nonzero(cells, axis=(1, 2)).tolist()):
+        results[job]["population"] = population
+    return results
+
+
+def _run_chunk(task):
+    return _run_jobs(*task)
+
+
+def run_batch(rules, seeds, size=64, generations=500, density=0.5, batch=256, workers=1):
+    # Every rule on the random soup of every seed. Soups are stepped batch at a time as one stacked
+    # array, batches are spread over worker processes. Returns one result per (rule, seed), in order.
+    jobs = [(parse_rule(rule).rulestring, seed) for rule in rules for seed in seeds]
+    tasks = [(jobs[first:first + batch], size, generations, density) for first in range(0, len(jobs), batch)]
+    if workers > 1 and len(tasks) > 1:
+        with Pool(workers) as pool:
+            chunks = pool.map(_run_chunk, tasks)
+    else:
+        chunks = map(_run_chunk, tasks)
+    return [result for chunk in chunks for result in chunk]
+
+
+def summarize(results, size):
+    # Per rule: soups that died out or froze, and the mean final density
+    summary = {}
+    for result in results:
+        entry = summary.setdefault(result["rule"], {"soups": 0, "extinct": 0, "still": 0, "active": 0,
+                                                    "mean_density": 0.0})
+        entry["soups"] += 1
+        entry[result["fate"]] += 1
+        entry["mean_density"] += result["population"] / (size * size)
+    for entry in summary.values():
+        entry["mean_density"] /= entry["soups"]
+    return summary
+
+
+def sweep(rules, seeds, size=64, generations=500, density=0.5, batch=256, workers=1):
+    start = time.perf_counter()
+    results = run_batch(rules, seeds, size, generations, density, batch, workers)
+    seconds = time.perf_counter() - start
+    return {"size": size, "generations": generations, "density": density, "seconds": seconds,
+            "summary": summarize(results, size), "results": results}
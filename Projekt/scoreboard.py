@@ -0,0 +1,373 @@
+import bisect
+import json
+import math
+import os
+import threading
+import time
+import zlib
+
+SCORES_FILE = "Assets/scores.jsonl"
+LEGACY_SCORES_FILE = "Assets/scores.json"
+STATS_SUFFIX = ".stats.json"
+BLOCK_SIZE = 1 << 16
+FINGERPRINT_SIZE = 4096  # Log bytes before the sidecar's offset whose CRC ties the sidecar to the log
+TOP_N = 10
+
+# Game times are counted in log-spaced buckets 5% wide, from 10 ms to far beyond any real game
+HISTOGRAM_START = 0.01
+HISTOGRAM_RATIO = 1.05
+HISTOGRAM_BUCKETS = 400
+
+
+def read_legacy_scores(path):
+    # Entries of the old scores.json, either {game: [entries]} or a flat list of entries with a "game" key
+    with open(path, "r") as file:
+        data = json.load(file)
+    if isinstance(data, dict):
+        return [dict(entry, game=game) for game, entries in data.items() for entry in entries]
+    if isinstance(data, list):
+        return [entry for entry in data if isinstance(entry, dict) and entry.get("game")]
+    return []
+
+
+def _encode(entry):
+    return (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _decode(line):
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    return entry if isinstance(entry, dict) and entry.get("game") else None
+
+
+def make_entry(game, time_taken, result, timestamp=None):
+    return {"game": game, "time": time_taken, "result": result,
+            "timestamp": timestamp or time.strftime("%Y-%m-%d %H:%M:%S")}
+
+
+def is_win(result):
+    # "Win" in Hangman, "X Wins" or "O Wins" in Tic Tac Toe
+    return result == "Win" or str(result).endswith(" Wins")
+
+
+def _bucket(seconds):
+    if seconds <= HISTOGRAM_START:
+        return 0
+    return min(HISTOGRAM_BUCKETS - 1, int(math.log(seconds / HISTOGRAM_START, HISTOGRAM_RATIO)) + 1)
+
+
+# Running totals of one game, updated per score so queries never look at the history
+class GameStats:
+    def __init__(self):
+        self.count = 0
+        self.wins = 0
+        self.total_time = 0.0
+        self.fastest_wins = []  # Sorted (time, timestamp) of the TOP_N fastest wins
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, entry):
+        seconds = float(entry.get("time", 0))
+        self.count += 1
+        self.total_time += seconds
+        self.histogram[_bucket(seconds)] += 1
+        if is_win(entry.get("result")):
+            self.wins += 1
+            if len(self.fastest_wins) < TOP_N or seconds < self.fastest_wins[-1][0]:
+                bisect.insort(self.fastest_wins, (seconds, entry.get("timestamp", "")))
+                del self.fastest_wins[TOP_N:]
+
+    @property
+    def win_rate(self):
+        return self.wins / self.count if self.count else 0.0
+
+    @property
+    def mean_time(self):
+        return self.total_time / self.count if self.count else 0.0
+
+    def percentile(self, percent):
+        # Upper edge of the bucket holding the percentile, within 5% of the exact time
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank:
+                return HISTOGRAM_START * HISTOGRAM_RATIO ** bucket
+        return HISTOGRAM_START * HISTOGRAM_RATIO ** (HISTOGRAM_BUCKETS - 1)
+
+    def to_dict(self):
+        return {"count": self.count, "wins": self.wins, "total_time": self.total_time,
+                "fastest_wins": self.fastest_wins,
+                "histogram": {str(i): n for i, n in enumerate(self.histogram) if n}}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count = data["count"]
+        stats.wins = data["wins"]
+        stats.total_time = data["total_time"]
+        stats.fastest_wins = [tuple(win) for win in data["fastest_wins"]]
+        for bucket, count in data["histogram"].items():
+            stats.histogram[int(bucket)] = count
+        return stats
+
+
+# Append-only JSON Lines score log; per-game aggregates are kept in a sidecar file next to it
+class ScoreLog:
+    def __init__(self, path=SCORES_FILE, legacy_path=LEGACY_SCORES_FILE):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.stats_path = path + STATS_SUFFIX
+        self._stats = {}  # game -> GameStats
+        self._offset = 0  # Bytes of the log already counted in _stats
+        self._loaded = False
+        self._lock = threading.RLock()  # The score writer thread appends while the game reads
+
+    def _migrate(self):
+        # The first run after the upgrade copies the old file into a new log, which appears atomically
+        if os.path.exists(self.path) or not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+        try:
+            entries = read_legacy_scores(self.legacy_path)
+        except (OSError, ValueError) as e:
+            print(f"Error reading {self.legacy_path}: {e}. Starting a new score log.")
+            return
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as file:
+            file.writelines(_encode(entry) for entry in entries)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.path)
+
+    def _load_stats(self):
+        self._loaded = True
+        self._migrate()
+        try:
+            with open(self.stats_path, "r") as file:
+                data = json.load(file)
+            stats = {game: GameStats.from_dict(game_stats) for game, game_stats in data["games"].items()}
+            offset, fingerprint = data["offset"], data["fingerprint"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return  # Missing or stale sidecar, the aggregates are rebuilt from the log
+        # A log replaced or restored since the sidecar was written no longer ends that offset with the same bytes
+        if fingerprint == self._fingerprint(offset):
+            self._stats, self._offset = stats, offset
+
+    def _fingerprint(self, offset):
+        # CRC of the log bytes just before offset, None when the log is shorter
+        start = max(0, offset - FINGERPRINT_SIZE)
+        try:
+            with open(self.path, "rb") as file:
+                file.seek(start)
+                data = file.read(offset - start)
+        except FileNotFoundError:
+            data = b""
+        return zlib.crc32(data) if len(data) == offset - start else None
+
+    def _save_stats(self):
+        # Not fsynced: a lost or stale sidecar only costs a rescan of the log
+        data = {"offset": self._offset, "fingerprint": self._fingerprint(self._offset),
+                "games": {game: stats.to_dict() for game, stats in self._stats.items()}}
+        temporary = self.stats_path + ".tmp"
+        with open(temporary, "w") as file:
+            json.dump(data, file, separators=(",", ":"))
+        os.replace(temporary, self.stats_path)
+
+    def _refresh(self):
+        with self._lock:
+            self._refresh_locked()
+
+    def _refresh_locked(self):
+        # Count the complete lines appended since the last call
+        if not self._loaded:
+            self._load_stats()
+        start = self._offset
+        try:
+            with open(self.path, "rb") as file:
+                file.seek(self._offset)
+                tail = b""
+                while True:
+                    block = file.read(BLOCK_SIZE)
+                    if not block:
+                        break
+                    lines = (tail + block).split(b"\n")
+                    tail = lines.pop()  # A torn last line is left for append to terminate
+                    for line in lines:
+                        self._offset += len(line) + 1
+                        if not line:
+                            continue
+                        entry = _decode(line)
+                        if entry is None:
+                            print(f"Skipping damaged line in {self.path}")
+                            continue
+                        self._stats.setdefault(entry["game"], GameStats()).add(entry)
+        except FileNotFoundError:
+            return
+        if self._offset != start:
+            self._save_stats()
+
+    def append(self, game, time_taken, result, timestamp=None):
+        entry = make_entry(game, time_taken, result, timestamp)
+        self.append_many([entry])
+        return entry
+
+    def append_many(self, entries):
+        # One write and one fsync for the whole batch
+        with self._lock:
+            self._refresh()
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "ab") as file:
+                # Close off a line left unfinished by a crash so it cannot swallow these entries
+                if file.tell() > self._offset:
+                    file.write(b"\n")
+                file.write(b"".join(_encode(entry) for entry in entries))
+                file.flush()
+                os.fsync(file.fileno())
+            self._refresh()
+
+    # ---------- Aggregates ----------
+    def stats(self, game):
+        self._refresh()
+        return self._stats.get(game, GameStats())
+
+    def leaderboard(self, game, n=TOP_N):
+        # Fastest wins as (time, timestamp), best first
+        return self.stats(game).fastest_wins[:n]
+
+    def games(self):
+        self._refresh()
+        return list(self._stats)
+
+    # ---------- History ----------
+    def _lines_backwards(self):
+        end = self._offset
+        with open(self.path, "rb") as file:
+            tail = b""
+            while end > 0:
+                start = max(0, end - BLOCK_SIZE)
+                file.seek(start)
+                lines = (file.read(end - start) + tail).split(b"\n")
+                end = start
+                tail = lines[0]
+                for line in reversed(lines[1:]):
+                    if line:
+                        yield line
+            if tail:
+                yield tail
+
+    def _lines_forwards(self):
+        with open(self.path, "rb") as file:
+            remaining = self._offset
+            for line in file:
+                remaining -= len(line)
+                if remaining < 0:
+                    break
+                yield line
+
+    def history(self, game=None, newest_first=True):
+        # Streams entries without loading the log into memory
+        self._refresh()
+        if not os.path.exists(self.path):
+            return
+        if newest_first:
+            lines = self._lines_backwards()
+        else:
+            lines = self._lines_forwards()
+        for line in lines:
+            entry = _decode(line)
+            if entry is not None and (game is None or entry["game"] == game):
+                yield entry
+
+    def page(self, game, page=0, page_size=20):
+        # Entries page * page_size onwards, newest first
+        entries = self.history(game)
+        for _ in range(page * page_size):
+            if next(entries, None) is None:
+                return []
+        return [entry for _, entry in zip(range(page_size), entries)]
+
+    def scores(self, game):
+        return list(self.history(game, newest_first=False))
+
+    def all(self):
+        scores = {}
+        for entry in self.history(newest_first=False):
+            scores.setdefault(entry["game"], []).append(entry)
+        return scores
+
+
+# Writes scores on a background thread in batches, so a slow disk never stalls a frame
+class ScoreWriter:
+    def __init__(self, log, interval=1.0, max_pending=256):
+        self.log = log
+        self.interval = interval  # Seconds a score may wait for others to share its write
+        self.max_pending = max_pending
+        self._pending = []
+        self._writing = False
+        self._flushing = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def submit(self, game, time_taken, result, timestamp=None):
+        entry = make_entry(game, time_taken, result, timestamp)
+        with self._condition:
+            if not self._closed:
+                # A full queue makes the game wait rather than lose scores
+                while len(self._pending) >= self.max_pending:
+                    self._condition.wait()
+                self._pending.append(entry)
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="score-writer", daemon=True)
+                    self._thread.start()
+                self._condition.notify_all()
+                return entry
+        self.log.append_many([entry])
+        return entry
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                # Let more scores gather unless someone is waiting for them
+                deadline = time.monotonic() + self.interval
+                while not self._closed and not self._flushing and len(self._pending) < self.max_pending:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch, self._pending = self._pending, []
+                if not batch:
+                    return
+                self._writing = True
+                self._condition.notify_all()
+            try:
+                self.log.append_many(batch)
+            except OSError as e:
+                print(f"Error writing scores to {self.log.path}: {e}")
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def flush(self):
+        # Blocks until every submitted score is on disk
+        with self._condition:
+            self._flushing += 1
+            self._condition.notify_all()
+            while self._pending or self._writing:
+                self._condition.wait()
+            self._flushing -= 1
+
+    def close(self):
+        # Flushes and stops the thread; later scores are written synchronously
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,124 @@
+MARKS = ("X", "O")
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# Board sizes and line lengths offered in the game, from classic to gomoku
+VARIANTS = ((3, 3), (7, 4), (15, 5), (19, 5))
+
+
+def line_masks(rows, cols, k):
+    # (shift, start mask) per direction; a cell in the start mask has room for k cells in that direction
+    masks = []
+    for dr, dc in DIRECTIONS:
+        start = 0
+        for row in range(rows):
+            for col in range(cols):
+                if 0 <= row + dr * (k - 1) < rows and 0 <= col + dc * (k - 1) < cols:
+                    start |= 1 << (row * cols + col)
+        if start:
+            masks.append((dr * cols + dc, start))
+    return masks
+
+
+def has_line(bits, masks, k):
+    # Whole-board check with shifts, k - 1 ANDs per direction
+    for shift, start in masks:
+        run = bits & start
+        for i in range(1, k):
+            run &= bits >> (shift * i)
+        if run:
+            return True
+    return False
+
+
+# m,n,k board: one integer bitboard per player, bit row * cols + col
+class Board:
+    def __init__(self, rows=3, cols=3, k=3):
+        if not 1 <= k <= max(rows, cols):
+            raise ValueError(f"Cannot get {k} in a row on a {rows}x{cols} board")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.bits = [0, 0]
+        self.moves = []  # Cell indexes in the order they were played
+        self.winner = None  # 0 or 1 once a player has k in a row
+        self.full = (1 << rows * cols) - 1
+
+    @property
+    def player(self):
+        return len(self.moves) % 2
+
+    @property
+    def occupied(self):
+        return self.bits[0] | self.bits[1]
+
+    def cell(self, row, col):
+        # 0, 1 or None
+        bit = 1 << (row * self.cols + col)
+        if self.bits[0] & bit:
+            return 0
+        if self.bits[1] & bit:
+            return 1
+        return None
+
+    def legal_moves(self):
+        free = self.full & ~self.occupied
+        while free:
+            low = free & -free
+            yield low.bit_length() - 1
+            free ^= low
+
+    @property
+    def is_over(self):
+        return self.winner is not None or self.occupied == self.full
+
+    def play(self, row, col):
+        # Places the current player's mark; returns the winner (0 or 1) or None
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise ValueError(f"({row}, {col}) is off the board")
+        return self.play_index(row * self.cols + col)
+
+    def play_index(self, index):
+        if self.occupied >> index & 1 or self.winner is not None:
+            raise ValueError(f"Cell {index} cannot be played")
+        player = self.player
+        self.bits[player] |= 1 << index
+        self.moves.append(index)
+        if self.wins_through(index, self.bits[player]):
+            self.winner = player
+        return self.winner
+
+    def undo(self):
+        index = self.moves.pop()
+        self.bits[len(self.moves) % 2] &= ~(1 << index)
+        self.winner = None
+
+    def wins_through(self, index, bits):
+        # Only the four lines through the last move can have become complete, at most k - 1 steps each way
+        row, col = divmod(index, self.cols)
+        for dr, dc in DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                r, c = row + sign * dr, col + sign * dc
+                while count < self.k and 0 <= r < self.rows and 0 <= c < self.cols \
+                        and bits >> (r * self.cols + c) & 1:
+                    count += 1
+                    r, c = r + sign * dr, c + sign * dc
+            if count >= self.k:
+                return True
+        return False
+
+
+def check_winner(board, k=None):
+    # Winning mark of a list-of-lists board, k in a row (default: the board's shorter side)
+    rows, cols = len(board), len(board[0])
+    k = k or min(rows, cols)
+    masks = line_masks(rows, cols, k)
+    for mark in MARKS:
+        bits = 0
+        for row in range(rows):
+            for col in range(cols):
+                if board[row][col] == mark:
+                    bits |= 1 << (row * cols + col)
+        if has_line(bits, masks, k):
+            return mark
+    return None
@@ -0,0 +1,288 @@
+import argparse
+import random
+import threading
+import time
+
+import tictactoe
+
+WIN = 1_000_000
+MAX_PLY = 1000
+EXACT, LOWER, UPPER = 0, 1, 2
+TABLE_LIMIT = 1 << 20  # Transposition table entries kept before it is cleared
+
+
+class _Timeout(Exception):
+    pass
+
+
+def symmetries(rows, cols):
+    # Cell permutations of the board's symmetries: 8 on a square, 4 otherwise
+    transforms = [lambda r, c: (r, c), lambda r, c: (r, cols - 1 - c),
+                  lambda r, c: (rows - 1 - r, c), lambda r, c: (rows - 1 - r, cols - 1 - c)]
+    if rows == cols:
+        transforms += [lambda r, c: (c, r), lambda r, c: (c, rows - 1 - r),
+                       lambda r, c: (rows - 1 - c, r), lambda r, c: (rows - 1 - c, rows - 1 - r)]
+    perms = []
+    for transform in transforms:
+        perm = [0] * (rows * cols)
+        for index in range(rows * cols):
+            r, c = transform(*divmod(index, cols))
+            perm[index] = r * cols + c
+        perms.append(perm)
+    return perms
+
+
+def windows(rows, cols, k):
+    # Every line of k cells as a list of cell indexes
+    lines = []
+    for dr, dc in tictactoe.DIRECTIONS:
+        for row in range(rows):
+            for col in range(cols):
+                if 0 <= row + dr * (k - 1) < rows and 0 <= col + dc * (k - 1) < cols:
+                    lines.append([(row + dr * i) * cols + col + dc * i for i in range(k)])
+    return lines
+
+
+# Negamax with alpha-beta, a symmetry-aware Zobrist transposition table and iterative deepening
+class Search:
+    def __init__(self, rows, cols, k, seed=0):
+        self.rows, self.cols, self.k = rows, cols, k
+        cells = rows * cols
+        rng = random.Random(seed)
+        self.zobrist = [[rng.getrandbits(64) for _ in range(cells)] for _ in range(2)]
+        self.perms = symmetries(rows, cols)
+        self.inverse = [[0] * cells for _ in self.perms]
+        for perm, inverse in zip(self.perms, self.inverse):
+            for index, image in enumerate(perm):
+                inverse[image] = index
+        self.table = {}  # canonical hash -> (depth, value, flag, best move in the canonical frame)
+        self.history = [0] * cells
+
+        # Line counts for the evaluation, kept up to date move by move
+        self.windows = windows(rows, cols, k)
+        self.cell_windows = [[] for _ in range(cells)]
+        for number, line in enumerate(self.windows):
+            for index in line:
+                self.cell_windows[index].append(number)
+        self.weights = [0] + [4 ** count for count in range(1, k + 1)]
+
+        # Only cells near the stones are searched on large boards
+        self.local = cells > 25
+        radius = 2 if k >= 5 else 1
+        self.near = []
+        for index in range(cells):
+            row, col = divmod(index, cols)
+            mask = 0
+            for r in range(max(0, row - radius), min(rows, row + radius + 1)):
+                for c in range(max(0, col - radius), min(cols, col + radius + 1)):
+                    mask |= 1 << (r * cols + c)
+            self.near.append(mask)
+        self.nodes = 0
+        self.stopped = threading.Event()  # Set from another thread to end the search early
+
+    # ---------- Position ----------
+    def _setup(self, board):
+        self.board = tictactoe.Board(board.rows, board.cols, board.k)
+        self.hashes = [0] * len(self.perms)
+        self.counts = [[0] * len(self.windows) for _ in range(2)]
+        self.score = 0  # Positive when X stands better
+        self.near_stack = [0]
+        for index in board.moves:
+            self._play(index)
+
+    def _window_value(self, number):
+        x, o = self.counts[0][number], self.counts[1][number]
+        if x and o:
+            return 0
+        return self.weights[x] - self.weights[o]
+
+    def _play(self, index):
+        player = self.board.player
+        for s, perm in enumerate(self.perms):
+            self.hashes[s] ^= self.zobrist[player][perm[index]]
+        for number in self.cell_windows[index]:
+            self.score -= self._window_value(number)
+            self.counts[player][number] += 1
+            self.score += self._window_value(number)
+        self.near_stack.append(self.near_stack[-1] | self.near[index])
+        self.board.play_index(index)
+
+    def _undo(self):
+        index = self.board.moves[-1]
+        self.board.undo()
+        player = self.board.player
+        for s, perm in enumerate(self.perms):
+            self.hashes[s] ^= self.zobrist[player][perm[index]]
+        for number in self.cell_windows[index]:
+            self.score -= self._window_value(number)
+            self.counts[player][number] -= 1
+            self.score += self._window_value(number)
+        self.near_stack.pop()
+
+    def _canonical(self):
+        # Smallest hash over the symmetric images, and the symmetry that gives it
+        key = min(self.hashes)
+        return key, self.hashes.index(key)
+
+    def _moves(self, first):
+        board = self.board
+        free = board.full & ~board.occupied
+        if self.local:
+            if not board.moves:
+                # Empty large board: start in the centre
+                return [(board.rows // 2) * board.cols + board.cols // 2]
+            # Cells next to a stone, every free cell once those are all taken
+            free = free & self.near_stack[-1] or free
+        moves = []
+        while free:
+            low = free & -free
+            moves.append(low.bit_length() - 1)
+            free ^= low
+        moves.sort(key=self.history.__getitem__, reverse=True)
+        if first is not None and first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    # ---------- Search ----------
+    def _negamax(self, depth, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes & 1023 and (time.perf_counter() > self.deadline or self.stopped.is_set()):
+            raise _Timeout
+        board = self.board
+        if board.winner is not None:
+            return -(WIN - ply)  # The previous move won
+        if board.occupied == board.full:
+            return 0
+        if depth == 0:
+            return self.score if board.player == 0 else -self.score
+
+        alpha_start = alpha
+        key, symmetry = self._canonical()
+        entry = self.table.get(key)
+        first = None
+        if entry is not None:
+            entry_depth, value, flag, move = entry
+            first = self.inverse[symmetry][move]
+            # Win scores are stored relative to this node
+            value = value - ply if value > WIN - MAX_PLY else value + ply if value < MAX_PLY - WIN else value
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        best_value, best_move = -WIN - 1, None
+        for move in self._moves(first):
+            self._play(move)
+            try:
+                value = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                self._undo()
+            if value > best_value:
+                best_value, best_move = value, move
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                self.history[move] += depth * depth
+                break
+
+        flag = UPPER if best_value <= alpha_start else LOWER if best_value >= beta else EXACT
+        stored = best_value + ply if best_value > WIN - MAX_PLY else best_value - ply if best_value < MAX_PLY - WIN \
+            else best_value
+        if len(self.table) >= TABLE_LIMIT:
+            self.table.clear()
+        self.table[key] = (depth, stored, flag, self.perms[symmetry][best_move])
+        return best_value
+
+    def choose(self, board, budget=1.0, max_depth=None):
+        # Deepens one ply at a time until the budget runs out; returns (move, value, depth reached)
+        self._setup(board)
+        self.deadline = time.perf_counter() + budget
+        empty = board.rows * board.cols - len(board.moves)
+        max_depth = min(max_depth or empty, empty)
+        best = (self._moves(None)[0], 0, 0)
+        for depth in range(1, max_depth + 1):
+            try:
+                value = self._negamax(depth, -WIN - 1, WIN + 1, 0)
+            except _Timeout:
+                break
+            key, symmetry = self._canonical()
+            best = (self.inverse[symmetry][self.table[key][3]], value, depth)
+            if abs(value) > WIN - MAX_PLY:
+                break  # Forced result found, deeper search cannot change it
+        return best
+
+
+# Runs the search on a background thread so the game keeps drawing while it thinks
+class ComputerPlayer:
+    def __init__(self, budget=1.0):
+        self.budget = budget
+        self._search = None
+        self._thread = None
+        self._move = None
+
+    @property
+    def thinking(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def cancel(self):
+        # Stops a running search within about a thousand nodes, even one that has not reached choose yet
+        if self.thinking:
+            self._search.stopped.set()
+            self._thread.join()
+        self._thread = None
+
+    def start(self, board):
+        self.cancel()
+        if self._search is None or (self._search.rows, self._search.cols, self._search.k) != \
+                (board.rows, board.cols, board.k):
+            self._search = Search(board.rows, board.cols, board.k)
+        self._search.stopped.clear()
+        snapshot = tictactoe.Board(board.rows, board.cols, board.k)
+        for index in board.moves:
+            snapshot.play_index(index)
+        self._move = None
+        self._thread = threading.Thread(target=self._run, args=(snapshot,), name="tictactoe-ai", daemon=True)
+        self._thread.start()
+
+    def _run(self, board):
+        self._move = self._search.choose(board, self.budget)[0]
+
+    def poll(self):
+        # The chosen cell index once the search is done, otherwise None
+        if self._thread is None or self._thread.is_alive():
+            return None
+        self._thread = None
+        return self._move
+
+
+def benchmark(size=3, k=3, budget=1.0, moves=4, seed=0):
+    # Nodes per second over the first moves of a game the engine plays against itself
+    search = Search(size, size, k, seed)
+    board = tictactoe.Board(size, size, k)
+    nodes = 0
+    start = time.perf_counter()
+    for _ in range(moves):
+        if board.is_over:
+            break
+        search.nodes = 0
+        move, value, depth = search.choose(board, budget)
+        nodes += search.nodes
+        board.play_index(move)
+    seconds = time.perf_counter() - start
+    return {"size": size, "k": k, "nodes": nodes, "seconds": seconds, "nodes_per_second": nodes / seconds}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tic Tac Toe search benchmark")
+    parser.add_argument("--budget", type=float, default=1.0, help="Seconds per move")
+    parser.add_argument("--moves", type=int, default=4)
+    args = parser.parse_args()
+    for size, k in tictactoe.VARIANTS:
+        result = benchmark(size, k, args.budget, args.moves)
+        print(f"{size}x{size}, {k} in a row: {result['nodes']} nodes in {result['seconds']:.2f}s "
+              f"({result['nodes_per_second']:.0f} nodes/s)")
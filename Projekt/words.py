@@ -0,0 +1,137 @@
+import mmap
+import os
+import random
+import struct
+from collections import Counter
+
+import numpy as np
+
+WORDS_FILE = "Assets/Hangman_data.txt"
+DEFAULT_WORDS = ["PYTHON", "HANGMAN", "COMPUTER"]
+INDEX_SUFFIX = ".idx"
+
+# Difficulty from letter rarity: words made of common letters are easy to guess
+EASY, MEDIUM, HARD = 0, 1, 2
+DIFFICULTIES = {"easy": EASY, "medium": MEDIUM, "hard": HARD}
+
+# Binary index: header, groups (difficulty, length, start, stop), word offsets, then the UTF-8 words
+MAGIC = b"WORDIDX1"
+HEADER = struct.Struct("<8sIII")
+
+_cache = {}  # (path, mtime, size) -> WordIndex
+
+
+# Words sorted by (difficulty, length), so every filter is a few contiguous ranges
+class WordIndex:
+    def __init__(self, blob, offsets, groups):
+        self._blob = blob  # bytes, or a view of the mapped index file
+        self._offsets = offsets
+        self.groups = groups  # (difficulty, length, start, stop) rows
+        self._ranges = {}
+        for difficulty, length, start, stop in groups.tolist():
+            for key in ((None, None), (difficulty, None), (None, length), (difficulty, length)):
+                self._ranges.setdefault(key, []).append((start, stop))
+
+    @classmethod
+    def from_words(cls, words):
+        words = sorted({word.strip().upper() for word in words if word.strip()})
+        letters = Counter()
+        for word in words:
+            letters.update(word)
+        total = sum(letters.values()) or 1
+        # Mean frequency of the distinct letters; rare letters make a low score and a hard word
+        scores = np.array([sum(letters[c] for c in set(word)) / len(set(word)) / total for word in words])
+        ranks = np.empty(len(words), dtype=np.int64)
+        ranks[np.argsort(-scores, kind="stable")] = np.arange(len(words))
+        difficulty = ranks * 3 // max(len(words), 1)
+        lengths = np.array([len(word) for word in words], dtype=np.int64)
+        order = np.lexsort((lengths, difficulty))
+
+        encoded = [words[i].encode("utf-8") for i in order.tolist()]
+        offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+        np.cumsum([len(word) for word in encoded], out=offsets[1:])
+        keys = np.stack((difficulty[order], lengths[order]), axis=1)
+        change = np.ones(len(keys), dtype=bool)
+        change[1:] = np.any(keys[1:] != keys[:-1], axis=1)
+        starts = np.flatnonzero(change)
+        stops = np.append(starts[1:], len(keys))
+        groups = np.column_stack((keys[starts], starts, stops)).astype("<u4").reshape(-1, 4)
+        return cls(b"".join(encoded), offsets, groups)
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def word(self, i):
+        return str(self._blob[self._offsets[i]:self._offsets[i + 1]], "utf-8")
+
+    def __iter__(self):
+        return (self.word(i) for i in range(len(self)))
+
+    def count(self, length=None, difficulty=None):
+        return sum(stop - start for start, stop in self._ranges.get((difficulty, length), []))
+
+    def choice(self, length=None, difficulty=None, rng=random):
+        # Uniform over the matching words, in time independent of the dictionary size
+        ranges = self._ranges.get((difficulty, length), [])
+        pick = rng.randrange(self.count(length, difficulty)) if ranges else None
+        for start, stop in ranges:
+            if pick < stop - start:
+                return self.word(start + pick)
+            pick -= stop - start
+        raise IndexError(f"No words of length {length} and difficulty {difficulty}")
+
+    def save(self, path):
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(HEADER.pack(MAGIC, len(self), len(self.groups), self._offsets[-1]))
+            file.write(self.groups.astype("<u4").tobytes())
+            file.write(self._offsets.astype("<u4").tobytes())
+            file.write(self._blob)
+        os.replace(temporary, path)
+
+
+def open_index(path):
+    # Maps a binary index; only the header and group table are read up front
+    with open(path, "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, count, group_count, blob_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a word index")
+    groups = np.frombuffer(data, dtype="<u4", count=group_count * 4, offset=HEADER.size).reshape(-1, 4)
+    offsets_start = HEADER.size + groups.nbytes
+    offsets = np.frombuffer(data, dtype="<u4", count=count + 1, offset=offsets_start)
+    blob_start = offsets_start + offsets.nbytes
+    if len(data) != blob_start + blob_size:
+        raise ValueError(f"{path} is truncated")
+    return WordIndex(memoryview(data)[blob_start:], offsets, groups)
+
+
+def read_words(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read().splitlines()
+
+
+def load_index(path=WORDS_FILE):
+    # Cached per file; a word list gets a binary index next to it, rebuilt when the list changes
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if key in _cache:
+        return _cache[key]
+    if path.endswith(INDEX_SUFFIX):
+        index = open_index(path)
+    else:
+        index_path = path + INDEX_SUFFIX
+        index = None
+        if os.path.exists(index_path) and os.stat(index_path).st_mtime_ns >= stat.st_mtime_ns:
+            try:
+                index = open_index(index_path)
+            except (OSError, ValueError, struct.error):
+                index = None
+        if index is None:
+            index = WordIndex.from_words(read_words(path))
+            try:
+                index.save(index_path)
+            except OSError:
+                pass  # Read-only install, keep the index in memory only
+    _cache[key] = index
+    return index